@@ -3,31 +3,117 @@
 __version__ = "0.3.0"
 __all__ = ["client", "errors"]
 
-from .errors import SwissParlError  # noqa
-from .client import SwissParlClient
-from pyodata.v2.service import GetEntitySetFilter as filter  # noqa
+import importlib
+import threading
+
+# Loaded on first access (PEP 562), so that importing the package does not
+# pull in pyodata, lxml and requests: name -> (module, attribute or None)
+_LAZY_ATTRIBUTES = {
+    "SwissParlClient": (".client", "SwissParlClient"),
+    "SwissParlError": (".errors", "SwissParlError"),
+    "create_session": (".session", "create_session"),
+    "iter_pages": (".stream", "iter_pages"),
+    "iter_rows": (".stream", "iter_rows"),
+    "filter": ("pyodata.v2.service", "GetEntitySetFilter"),
+    "client": (".client", None),
+    "columnar": (".columnar", None),
+    "errors": (".errors", None),
+    "session": (".session", None),
+    "stream": (".stream", None),
+    "transcripts": (".transcripts", None),
+}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def get_client():
+    """
+    Return the process-wide client used by the helper functions.
+
+    It is created on first use with a pooled keep-alive session, so the
+    OData service and its metadata are only initialised once per process.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from .client import SwissParlClient
+                from .session import create_session
+
+                _client = SwissParlClient(session=create_session())
+    return _client
 
 
 def get_tables():
-    client = SwissParlClient()
-    return client.get_tables()
+    return get_client().get_tables()
 
 
 def get_variables(table):
-    client = SwissParlClient()
-    return client.get_variables(table)
+    return get_client().get_variables(table)
 
 
 def get_overview():
-    client = SwissParlClient()
-    return client.get_overview()
+    return get_client().get_overview()
 
 
 def get_glimpse(table, rows=5):
-    client = SwissParlClient()
-    return client.get_glimpse(table, rows)
+    return get_client().get_glimpse(table, rows)
+
+
+def get_data(table, filter=None, stream=False, format=None, **kwargs):  # noqa
+    """
+    Load the rows of `table`.
+
+    By default a SwissParlResponse is returned. With `stream=True` rows are
+    streamed (see iter_data); with `format="arrow"`, `"numpy"` or `"pandas"`
+    the result is built column by column (see columnar.get_columnar). The two
+    cannot be combined: `stream=True` with a `format` raises ValueError.
+    """
+    if stream and format:
+        raise ValueError("stream=True cannot be combined with format; "
+                         "use iter_data() for rows or to_parquet() for large tables")
+    if stream:
+        return iter_data(table, filter, **kwargs)
+    if format:
+        from . import columnar
+
+        return columnar.get_columnar(get_client(), table, filter, format=format, **kwargs)
+    return get_client().get_data(table, filter, **kwargs)
+
+
+def iter_data(table, filter=None, chunked=False, page_size=None, **kwargs):  # noqa
+    """
+    Stream the rows of `table` without keeping the whole result in memory.
+
+    Rows are yielded one by one as dicts (or as lists of dicts per page with
+    `chunked=True`), following the server-side paging of the OData service.
+    Use `page_size` to request pages of a given size with `$top` / `$skip`.
+    """
+    from .stream import iter_pages, iter_rows
+
+    if chunked:
+        return iter_pages(get_client(), table, filter, page_size, **kwargs)
+    return iter_rows(get_client(), table, filter, page_size, **kwargs)
+
 
+def to_parquet(table, path, filter=None, **kwargs):  # noqa
+    """Write `table` to a local Parquet file page by page, return the row count."""
+    from . import columnar
 
-def get_data(table, filter=None, **kwargs):  # noqa
-    client = SwissParlClient()
-    return client.get_data(table, filter, **kwargs)
+    return columnar.to_parquet(get_client(), table, path, filter, **kwargs)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Measure the cold-start cost of the package and fail above a budget.
+
+Every measurement runs in a fresh interpreter:
+
+- import: `import swissparlpy` alone, which must not load pyodata,
+  lxml or requests (they are imported lazily on first use);
+- first call: import + `get_tables()` with a warm `$metadata` cache
+  (the cache is filled by a first, unmeasured run).
+
+The median of `--runs` runs is compared with the thresholds; the script
+exits with status 1 if one of them is exceeded.
+
+    python bench_startup.py [--runs 5] [--max-import-ms 50] [--max-first-call-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pyodata", "lxml", "requests")
+
+IMPORT_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {package}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+FIRST_CALL_CODE = """
+import json, time
+start = time.perf_counter()
+import {package}
+tables = {package}.get_tables()
+print(json.dumps({{"seconds": time.perf_counter() - start, "tables": len(tables)}}))
+"""
+
+
+def run(code, env):
+    """Run `code` in a new interpreter and return its JSON output."""
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(code, env, runs):
+    results = [run(code, env) for _ in range(runs)]
+    return statistics.median(r["seconds"] for r in results) * 1000, results[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and first-call time budget")
+    parser.add_argument("--package", default="swissparlpy", help="Package to import (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (default: %(default)s)")
+    parser.add_argument("--max-import-ms", type=float, default=50.0,
+                        help="Budget for the import alone (default: %(default)s)")
+    parser.add_argument("--max-first-call-ms", type=float, default=1500.0,
+                        help="Budget for import + get_tables() (default: %(default)s)")
+    parser.add_argument("--cache-dir", help="Metadata cache directory (SWISSPARL_CACHE_DIR)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.cache_dir:
+        env["SWISSPARL_CACHE_DIR"] = args.cache_dir
+    failures = []
+
+    import_ms, result = measure(IMPORT_CODE.format(package=args.package, heavy=HEAVY_MODULES), env, args.runs)
+    print(f"import {args.package}: {import_ms:.1f} ms (budget {args.max_import_ms:.0f} ms)")
+    if result["heavy"]:
+        failures.append(f"import loads {', '.join(result['heavy'])}")
+    if import_ms > args.max_import_ms:
+        failures.append(f"import took {import_ms:.1f} ms")
+
+    code = FIRST_CALL_CODE.format(package=args.package)
+    run(code, env)  # fill the metadata cache
+    first_call_ms, result = measure(code, env, args.runs)
+    print(f"first get_tables(): {first_call_ms:.1f} ms for {result['tables']} tables "
+          f"(budget {args.max_first_call_ms:.0f} ms)")
+    if first_call_ms > args.max_first_call_ms:
+        failures.append(f"first get_tables() took {first_call_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"  ✗ {failure}")
+    if not failures:
+        print("  ✓ within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
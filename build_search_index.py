@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Construit un index de recherche plein texte (FR/DE/IT) pour les objets
+(cdf_efk_data.json) et les débats (debates_data.json), découpé par préfixe :
+une recherche ne télécharge que les fichiers des préfixes de ses termes.
+
+    data/<jeu>/search/index.json            documents, champs, liste des fragments
+    data/<jeu>/search/terms/<préfixe>.json  terme -> postings
+
+Les termes sont en minuscules, sans accents ni balises HTML ; avec --stem,
+un radical léger est calculé selon la langue du champ (pluriels et
+terminaisons courantes). La recherche côté site doit appliquer la même
+normalisation (fold_text, puis stem si "stemmed" vaut true dans index.json).
+
+Postings : liste plate [écart, masque, écart, masque, ...] où écart est la
+différence avec le numéro de document précédent (position dans "docs") et
+masque le champ de bits des champs contenant le terme (voir "fields").
+
+    python build_search_index.py [--stem] [--prefix-length 2]
+    python build_search_index.py --benchmark
+"""
+
+import argparse
+import gzip
+import html
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "cantons"))
+from output import GENERATED_AT, content_digest, dumps, write_json  # noqa: E402
+
+OUTPUT_DIR = "data"
+PREFIX_LENGTH = 2
+MIN_TERM_LENGTH = 2
+
+HTML_TAG = re.compile(r"<[^>]*>")
+WORD = re.compile(r"[a-z0-9]+")
+
+# Mots trop fréquents pour être utiles (déjà sans accents)
+STOPWORDS = {
+    "fr": {"le", "la", "les", "de", "des", "du", "un", "une", "et", "en", "au", "aux", "a",
+           "pour", "par", "sur", "dans", "que", "qui", "est", "il", "elle", "ce", "cette",
+           "ces", "se", "sa", "son", "ses", "ne", "pas", "plus", "ou", "avec", "d", "l", "qu"},
+    "de": {"der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "eines", "und",
+           "in", "im", "zu", "zur", "zum", "von", "mit", "auf", "fur", "ist", "es", "sie",
+           "er", "wir", "nicht", "auch", "als", "an", "am", "bei", "dass", "wie", "oder"},
+    "it": {"il", "lo", "la", "le", "gli", "i", "di", "del", "della", "dei", "delle", "un",
+           "una", "e", "in", "per", "con", "su", "che", "non", "da", "al", "alla", "si"},
+}
+
+# Terminaisons retirées par le radical léger, les plus longues d'abord
+SUFFIXES = {
+    "fr": ("ements", "ement", "ations", "ation", "euses", "euse", "eaux", "aux",
+           "ees", "ee", "es", "s", "x", "e"),
+    "de": ("ungen", "ung", "heiten", "heit", "keiten", "keit", "innen", "en", "er", "es",
+           "e", "n", "s"),
+    "it": ("azioni", "azione", "menti", "mente", "i", "e", "o", "a"),
+}
+MIN_STEM_LENGTH = 4
+
+# Champs indexés par jeu de données : nom -> (bit, langue) ; langue None =
+# langue de l'élément (champ "language" des débats)
+DATASETS = {
+    "objects": {
+        "source": "cdf_efk_data.json",
+        "id": "shortId",
+        "fields": {
+            "title": (1, "fr"),
+            "title_de": (2, "de"),
+            "text": (4, "fr"),
+            "text_de": (8, "de"),
+        },
+    },
+    "debates": {
+        "source": "debates_data.json",
+        "id": "id",
+        "fields": {
+            "text": (1, None),
+            "business_title_fr": (2, "fr"),
+            "business_title_de": (4, "de"),
+            "business_title_it": (8, "it"),
+        },
+    },
+}
+
+
+def fold_text(text: str) -> str:
+    """Texte sans balises HTML, sans accents et en minuscules."""
+    text = html.unescape(HTML_TAG.sub(" ", text or ""))
+    decomposed = unicodedata.normalize("NFKD", text.replace("ß", "ss"))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def stem(term: str, lang: str) -> str:
+    """Radical léger : retire la plus longue terminaison connue de la langue."""
+    for suffix in SUFFIXES.get(lang, ()):
+        if term.endswith(suffix) and len(term) - len(suffix) >= MIN_STEM_LENGTH:
+            return term[:-len(suffix)]
+    return term
+
+
+def tokenize(text: str, lang: str, stemming: bool = False) -> Iterator[str]:
+    stopwords = STOPWORDS.get(lang, set())
+    for term in WORD.findall(fold_text(text)):
+        if len(term) < MIN_TERM_LENGTH or term in stopwords:
+            continue
+        yield stem(term, lang) if stemming else term
+
+
+def term_prefix(term: str, prefix_length: int = PREFIX_LENGTH) -> str:
+    return term[:prefix_length]
+
+
+def build_index(items: List[dict], config: dict, stemming: bool = False) -> Dict:
+    """{"docs": [ids], "terms": {terme: {numéro de document: masque}}}."""
+    docs, terms = [], {}
+    for item in items:
+        doc = len(docs)
+        docs.append(str(item.get(config["id"], "")))
+        item_lang = (item.get("language") or "fr").lower()
+        for field, (bit, lang) in config["fields"].items():
+            value = item.get(field)
+            if not value:
+                continue
+            for term in set(tokenize(value, lang or item_lang, stemming)):
+                postings = terms.setdefault(term, {})
+                postings[doc] = postings.get(doc, 0) | bit
+    return {"docs": docs, "terms": terms}
+
+
+def encode_postings(postings: Dict[int, int]) -> List[int]:
+    """[écart, masque, ...] par numéro de document croissant."""
+    encoded, previous = [], 0
+    for doc in sorted(postings):
+        encoded += [doc - previous, postings[doc]]
+        previous = doc
+    return encoded
+
+
+def shard_index(index: Dict, prefix_length: int = PREFIX_LENGTH) -> Dict[str, Dict]:
+    shards = {}
+    for term in sorted(index["terms"]):
+        shards.setdefault(term_prefix(term, prefix_length), {})[term] = encode_postings(index["terms"][term])
+    return shards
+
+
+def write_index(name: str, index: Dict, shards: Dict[str, Dict], stemming: bool,
+                prefix_length: int, output_dir: str = OUTPUT_DIR) -> int:
+    """Écrit les fragments et index.json ; renvoie le nombre de fichiers écrits."""
+    config = DATASETS[name]
+    directory = Path(output_dir) / name / "search"
+    # Fragments dans leur propre dossier : un préfixe ne peut pas écraser index.json
+    terms_directory = directory / "terms"
+    terms_directory.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    entries = {}
+    for prefix, shard in shards.items():
+        written += write_json(str(terms_directory / f"{prefix}.json"), shard)
+        entries[prefix] = {"terms": len(shard), "hash": content_digest(shard)[:16]}
+
+    # Supprimer les fragments des préfixes disparus (et ceux de l'ancienne
+    # disposition, directement dans search/)
+    for path in terms_directory.iterdir():
+        if path.name.split(".json")[0] not in entries:
+            path.unlink()
+    for path in directory.iterdir():
+        if path.is_file() and path.name.split(".json")[0] != "index":
+            path.unlink()
+
+    manifest = {
+        "metadata": {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "dataset": name,
+            "source": config["source"],
+            "id_field": config["id"],
+            "stemmed": stemming,
+            "prefix_length": prefix_length,
+            "shard_path": "terms/{prefix}.json",
+            "min_term_length": MIN_TERM_LENGTH,
+            "terms": len(index["terms"]),
+        },
+        "fields": {field: bit for field, (bit, _) in config["fields"].items()},
+        "docs": index["docs"],
+        "shards": entries,
+    }
+    written += write_json(str(directory / "index.json"), manifest, volatile=[GENERATED_AT])
+    return written
+
+
+def load_items(name: str) -> List[dict]:
+    with open(DATASETS[name]["source"], "r", encoding="utf-8") as f:
+        return json.load(f).get("items", [])
+
+
+def benchmark(name: str, stemming: bool, prefix_length: int) -> None:
+    """Taille de l'index et temps de construction selon la taille du corpus."""
+    items = load_items(name)
+    config = DATASETS[name]
+    print(f"\n{name} ({config['source']}, stem={stemming}, préfixe={prefix_length})")
+    print(f"{'docs':>6} {'texte Ko':>9} {'termes':>8} {'postings':>9} {'index Ko':>9} "
+          f"{'gzip Ko':>8} {'fragments':>9} {'build ms':>9}")
+    for fraction in (0.1, 0.25, 0.5, 1.0):
+        subset = items[:max(1, int(len(items) * fraction))]
+        text_bytes = sum(len(str(item.get(field) or "").encode("utf-8"))
+                         for item in subset for field in config["fields"])
+        start = time.perf_counter()
+        index = build_index(subset, config, stemming)
+        shards = shard_index(index, prefix_length)
+        elapsed = (time.perf_counter() - start) * 1000
+        data = [dumps(shard) for shard in shards.values()] + [dumps(index["docs"])]
+        size = sum(len(d) for d in data)
+        gzipped = sum(len(gzip.compress(d, mtime=0)) for d in data)
+        postings = sum(len(p) for p in index["terms"].values())
+        print(f"{len(subset):>6} {text_bytes / 1024:>9.0f} {len(index['terms']):>8} {postings:>9} "
+              f"{size / 1024:>9.0f} {gzipped / 1024:>8.0f} {len(shards):>9} {elapsed:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit l'index de recherche du site")
+    parser.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument("--stem", action="store_true", help="Indexer des radicaux légers")
+    parser.add_argument("--prefix-length", type=int, default=PREFIX_LENGTH)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Mesurer taille et temps de construction sans rien écrire")
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        if not os.path.exists(DATASETS[name]["source"]):
+            print(f"{name}: {DATASETS[name]['source']} introuvable, ignoré")
+            continue
+        if args.benchmark:
+            benchmark(name, args.stem, args.prefix_length)
+            continue
+        start = time.perf_counter()
+        index = build_index(load_items(name), DATASETS[name], args.stem)
+        shards = shard_index(index, args.prefix_length)
+        written = write_index(name, index, shards, args.stem, args.prefix_length, args.output_dir)
+        print(f"{name}: {len(index['docs'])} documents, {len(index['terms'])} termes, "
+              f"{len(shards)} fragments ({written} fichier(s) écrit(s)) "
+              f"en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
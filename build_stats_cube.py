@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Pré-calcule les statistiques des pages stats (stats.js, stats_de.js,
+stats_it.js) sous forme de cube creux, écrit dans data/stats.json :
+
+    "objects" / "debates": {
+        "dimensions": ["year", "party", ...],
+        "values": {"year": ["2016", ...], ...},   valeurs de chaque dimension
+        "cells": [[i_year, i_party, ..., nombre], ...],
+        "totals": {"year": {"2016": 12, ...}, ...} (sans filtre, premier affichage)
+    }
+
+Chaque cellule compte les éléments qui ont exactement cette combinaison de
+valeurs ; un graphique filtré additionne les cellules retenues par les
+filtres, groupées par la dimension du graphique. Les dimensions n'ont que
+peu de valeurs (année, législature, type de session, conseil, parti,
+département, type...) : le nombre de cellules est borné par leur produit
+et non par le nombre d'éléments.
+
+Les champs à nombreuses valeurs (auteurs, orateurs, thématiques) sont
+publiés à part, en classements des TOP_N valeurs les plus fréquentes :
+
+        "top": {"author": [["Nom", 12], ...], "tags": [...]}
+
+Les valeurs sont neutres (codes de parti normalisés comme normalizeParty de
+stats.js, codes de type, de conseil, de département) : les libellés restent
+dans chaque page selon la langue.
+
+    python build_stats_cube.py [--output data/stats.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "cantons"))
+from output import GENERATED_AT, write_json  # noqa: E402
+
+OUTPUT_FILE = os.path.join("data", "stats.json")
+
+# Parti déduit de l'auteur quand l'objet n'en a pas (getPartyFromAuthor)
+AUTHOR_PARTY_MARKERS = [
+    ("PLR", ("FDP", "PLR", "libéral-radical", "liberale radicale")),
+    ("pvl", ("Grünliberale", "vert'libéral", "verde liberale")),
+    ("UDC", ("SVP", "UDC", "Schweizerischen Volkspartei", "Union démocratique", "Unione democratica")),
+    ("PSS", ("SP ", "PS ", "socialiste", "socialista", "Sozialdemokratische")),
+    ("VERT-E-S", ("Grüne", "Verts", "VERT", "Verdi")),
+    ("Le Centre", ("Mitte", "Centre", "Centro", "EVP")),
+]
+
+# Codes de parti normalisés (normalizeParty de stats.js)
+PARTY_NORMALIZATION = {
+    "PSS": "PS", "Les Vert-e-s": "VERT-E-S", "Al": "VERT-E-S",
+    "pvl": "Vert'libéraux", "PVL": "Vert'libéraux",
+    "Centre": "Le Centre", "M-E": "Le Centre", "PDC": "Le Centre", "PBD": "Le Centre",
+    "CSPO": "Le Centre", "CVP": "Le Centre", "BDP": "Le Centre",
+}
+
+# Groupes parlementaires des débats (debatePartyLabels de stats.js) ;
+# sans groupe = Conseil fédéral
+DEBATE_PARTIES = {
+    "V": "UDC", "S": "PS", "RL": "PLR", "M-E": "Le Centre", "CE": "Le Centre",
+    "C": "Le Centre", "BD": "Le Centre", "G": "VERT-E-S", "GL": "Vert'libéraux",
+}
+FEDERAL_COUNCIL = "Conseil fédéral"
+
+# Auteurs exclus du classement des auteurs (commissions, groupes)
+NON_PERSON_AUTHORS = ("Commission", "Kommission", "Fraktion")
+
+SESSION_TYPES = ("printemps", "ete", "automne", "hiver")
+
+# Longueur des classements (auteurs, orateurs, thématiques)
+TOP_N = 30
+
+
+def legislature(date: str) -> str:
+    """Législature d'une date ISO (getLegislature de stats.js)."""
+    if date >= "2023-12-01":
+        return "52"
+    if date >= "2019-12-01":
+        return "51"
+    if date >= "2015-12-01":
+        return "50"
+    return ""
+
+
+def session_type(date: str, sessions: List[Dict]) -> str:
+    """Type de la session qui contient la date ("autre" hors session)."""
+    for session in sessions:
+        if session["start"] <= date <= session["end"]:
+            kind = session["id"].split("-")[1] if "-" in session["id"] else ""
+            if kind.startswith("speciale"):
+                return "speciale"
+            return kind if kind in SESSION_TYPES else "autre"
+    return "autre"
+
+
+def object_party(item: Dict) -> str:
+    party = item.get("party")
+    if not party:
+        author = item.get("author") or ""
+        party = next((code for code, markers in AUTHOR_PARTY_MARKERS
+                      if any(marker in author for marker in markers)), "")
+    return PARTY_NORMALIZATION.get(party, party)
+
+
+def speaker_kind(function_speaker: str) -> str:
+    """"cf" (Conseil fédéral), "bk" (Chancellerie) ou "deputy"."""
+    function_speaker = function_speaker or ""
+    if function_speaker.startswith(("BR", "VPBR", "BPR")):
+        return "cf"
+    if function_speaker.startswith("BK"):
+        return "bk"
+    return "deputy"
+
+
+def split_tags(tags: str) -> List[str]:
+    """Thématiques distinctes d'un élément, triées."""
+    return sorted({t.strip() for t in (tags or "").split("|") if t.strip()})
+
+
+def object_dimensions(sessions: List[Dict]) -> Dict[str, Callable[[Dict], str]]:
+    return {
+        "year": lambda item: (item.get("date") or "")[:4],
+        "legislature": lambda item: legislature(item.get("date") or ""),
+        "session_type": lambda item: session_type(item.get("date") or "", sessions),
+        "council": lambda item: {"NR": "N", "SR": "S"}.get(item.get("council"), item.get("council") or ""),
+        "party": object_party,
+        "department": lambda item: item.get("department") or "none",
+        "type": lambda item: item.get("type") or "",
+        "mention": lambda item: item.get("mention") or "",
+    }
+
+
+def object_rankings() -> Dict[str, Callable[[Dict], List[str]]]:
+    return {
+        "author": lambda item: [] if any(m in (item.get("author") or "") for m in NON_PERSON_AUTHORS)
+                               else [item["author"]] if item.get("author") else [],
+        "tags": lambda item: split_tags(item.get("tags")),
+    }
+
+
+def debate_dimensions(sessions: List[Dict]) -> Dict[str, Callable[[Dict], str]]:
+    def iso_date(item):
+        date = item.get("date") or ""
+        return f"{date[:4]}-{date[4:6]}-{date[6:8]}" if len(date) == 8 else date
+
+    return {
+        "year": lambda item: (item.get("date") or "")[:4],
+        "legislature": lambda item: (item.get("id_session") or "")[:2],
+        "session_type": lambda item: session_type(iso_date(item), sessions),
+        "council": lambda item: item.get("council") or "",
+        "party": lambda item: DEBATE_PARTIES.get(item.get("party") or "", item.get("party") or FEDERAL_COUNCIL),
+        "department": lambda item: item.get("department") or "none",
+        "speaker_kind": lambda item: speaker_kind(item.get("function_speaker")),
+    }
+
+
+def debate_rankings(tags_by_business: Dict[str, str]) -> Dict[str, Callable[[Dict], List[str]]]:
+    return {
+        "speaker": lambda item: [item["speaker"]] if item.get("speaker") else [],
+        "tags": lambda item: split_tags(tags_by_business.get(item.get("business_number") or "")),
+    }
+
+
+def build_cube(items: Sequence[Dict], dimensions: Dict[str, Callable[[Dict], str]]) -> Dict:
+    """Cube creux des éléments selon `dimensions` (nom -> fonction de l'élément)."""
+    names = list(dimensions)
+    functions = [dimensions[name] for name in names]
+    # Une ligne par élément, puis un seul regroupement sur les lignes entières
+    rows = Counter(tuple(function(item) for function in functions) for item in items)
+
+    values = {name: sorted({row[i] for row in rows}) for i, name in enumerate(names)}
+    positions = [{value: index for index, value in enumerate(values[name])} for name in names]
+    cells = sorted([positions[i][value] for i, value in enumerate(row)] + [count]
+                   for row, count in rows.items())
+
+    totals = {}
+    for i, name in enumerate(names):
+        counts = Counter()
+        for row, count in rows.items():
+            counts[row[i]] += count
+        totals[name] = dict(sorted(counts.items()))
+
+    return {"dimensions": names, "values": values, "cells": cells, "totals": totals, "count": len(items)}
+
+
+def build_rankings(items: Sequence[Dict], rankings: Dict[str, Callable[[Dict], List[str]]],
+                   top_n: int = TOP_N) -> Dict[str, List]:
+    """Les `top_n` valeurs les plus fréquentes de chaque classement, [[valeur, nombre], ...]."""
+    top = {}
+    for name, function in rankings.items():
+        counts = Counter(value for item in items for value in function(item))
+        top[name] = [[value, count] for value, count in
+                     sorted(counts.items(), key=lambda entry: (-entry[1], entry[0]))[:top_n]]
+    return top
+
+
+def load_items(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        print(f"{path} introuvable, ignoré")
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("items", [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-calcule les statistiques du site")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    with open("sessions.json", "r", encoding="utf-8") as f:
+        sessions = json.load(f).get("sessions", [])
+    objects = load_items("cdf_efk_data.json")
+    debates = load_items("debates_data.json")
+
+    # Thématiques des débats : celles de l'objet, sinon missing_objects_tags.json
+    tags_by_business = {item["business_number"]: item["tags"]
+                        for item in load_items("missing_objects_tags.json")
+                        if item.get("business_number") and item.get("tags")}
+    tags_by_business.update({item["shortId"]: item["tags"]
+                             for item in objects if item.get("shortId") and item.get("tags")})
+
+    stats = {
+        "metadata": {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "objects": dict(build_cube(objects, object_dimensions(sessions)),
+                        top=build_rankings(objects, object_rankings())),
+        "debates": dict(build_cube(debates, debate_dimensions(sessions)),
+                        top=build_rankings(debates, debate_rankings(tags_by_business))),
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    written = write_json(args.output, stats, volatile=[GENERATED_AT])
+    for name in ("objects", "debates"):
+        print(f"{name}: {stats[name]['count']} éléments, {len(stats[name]['cells'])} cellules")
+    print(f"{'✅ Enregistré' if written else 'Inchangé'}: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
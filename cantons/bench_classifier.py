@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Check MentionClassifier against the labelled corpus and measure its throughput.
+
+The corpus (classifier_corpus.json) holds titles, snippets, excerpts and
+document names from cantonal_efk_mentions.json with the labels produced
+by the original pattern-by-pattern implementation. Any disagreement is
+listed and makes the script exit with status 1.
+
+    python bench_classifier.py [--rounds 200]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from fetch_cantonal_mentions import (
+    CLASSIFIER,
+    EFK_KEYWORDS,
+    EXCLUDE_PATTERNS,
+    FEDERAL_PATTERNS,
+    LANGUAGE_KEYWORDS_DE,
+    LANGUAGE_KEYWORDS_FR,
+)
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classifier_corpus.json")
+
+
+def reference_classify(text: str) -> dict:
+    """Original implementation: one re.search / substring test per pattern."""
+    excluded = any(re.search(p, text, re.IGNORECASE) for p in EXCLUDE_PATTERNS) if text else False
+    federal = bool(text) and not excluded and any(
+        re.search(p, text, re.IGNORECASE) for p in FEDERAL_PATTERNS)
+    text_lower = text.lower()
+    mentions_efk = bool(text) and any(kw in text_lower for kw in EFK_KEYWORDS)
+    fr_count = sum(1 for kw in LANGUAGE_KEYWORDS_FR if kw.lower() in text_lower)
+    de_count = sum(1 for kw in LANGUAGE_KEYWORDS_DE if kw.lower() in text_lower)
+    language = "fr" if fr_count > de_count else "de" if de_count > fr_count else "unknown"
+    return {"excluded": excluded, "federal": federal, "mentions_efk": mentions_efk, "language": language}
+
+
+def check_corpus(cases: list) -> int:
+    """Compare classifier output with the corpus labels, return the number of mismatches."""
+    mismatches = 0
+    for case in cases:
+        result = CLASSIFIER.classify(case["text"])
+        for label in ("excluded", "federal", "mentions_efk", "language"):
+            if result[label] != case[label]:
+                mismatches += 1
+                print(f"  ✗ {label}: expected {case[label]!r}, got {result[label]!r} — {case['text'][:80]!r}")
+    return mismatches
+
+
+def throughput(classify, texts: list, rounds: int) -> float:
+    """Return texts classified per second."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            classify(text)
+    return rounds * len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classifier regression check and benchmark")
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the corpus (default: 200)")
+    args = parser.parse_args()
+
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+
+    print(f"Corpus: {len(cases)} labelled texts")
+    mismatches = check_corpus(cases)
+    print(f"  {'✓ all labels match' if not mismatches else f'{mismatches} mismatch(es)'}")
+
+    texts = [case["text"] for case in cases]
+    size_mb = sum(len(t.encode("utf-8")) for t in texts) * args.rounds / 1e6
+
+    compiled = throughput(CLASSIFIER.classify, texts, args.rounds)
+    reference = throughput(reference_classify, texts, args.rounds)
+    print(f"\nThroughput ({args.rounds} rounds, {size_mb:.1f} MB):")
+    print(f"  MentionClassifier:  {compiled:10.0f} texts/s")
+    print(f"  per-pattern search: {reference:10.0f} texts/s")
+    print(f"  speedup:            {compiled / reference:10.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of fetch_cantonal_mentions.py against a local stand-in
+of the OpenParlData API.
+
+The stand-in serves /affairs/ searches, /affairs/{id}/docs/,
+/affairs/{id}/contributors/, /bodies/ and the parliament pages scraped for
+authors, with a configurable latency per request. Its payloads come from a
+recording (--recording, JSON with "affairs", "docs", "contributors" and
+"bodies") or are rebuilt from cantonal_efk_mentions.json. The pipeline runs
+in a child process, stage by stage as in main():
+
+    fetch_body_info -> fetch_all_federal_mentions -> enrich_with_body_names
+    -> enrich_with_documents_and_authors -> save_results
+
+Wall time per stage, requests and bytes per endpoint and the peak RSS of the
+pipeline are printed and appended to a JSON results file, with the
+difference to the previous run.
+
+    python bench_pipeline.py [--latency-ms 50] [--scale 1] [--max-workers 8]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILE = os.path.join(SCRIPT_DIR, "cantonal_efk_mentions.json")
+RESULTS_FILE = os.path.join(SCRIPT_DIR, "bench_pipeline_results.json")
+
+# Searches also match the title and snippet text of the affairs
+SEARCHED_FIELDS = ["title_de", "title_fr", "title_it", "title_long_de", "title_long_fr"]
+AFFAIR_PATH = re.compile(r"^/v1/affairs/(\d+)/(docs|contributors)/$")
+PAGE_PATH = re.compile(r"^/pages/(\d+)$")
+
+
+def build_recording(source_file: str = SOURCE_FILE, scale: int = 1) -> Dict:
+    """API payloads rebuilt from a previous output file.
+    Snippets are made from the stored excerpts and document names, documents
+    from efk_documents / all_documents and contributors from the authors.
+    With `scale` > 1 the affairs are repeated under new ids."""
+    with open(source_file, "r", encoding="utf-8") as f:
+        records = json.load(f).get("data", [])
+
+    recording = {"affairs": [], "docs": {}, "contributors": {}, "bodies": {}}
+    max_id = max((int(r["id"]) for r in records if str(r.get("id", "")).isdigit()), default=0)
+    for copy in range(scale):
+        for record in records:
+            affair_id = int(record["id"]) + copy * (max_id + 1)
+            docs = (record.get("efk_documents") or []) + (record.get("efk_documents_de") or []) \
+                + (record.get("all_documents") or [])
+            snippets = [{"text": e["text"], "source_name": e.get("source", ""),
+                         "source_type": "docs" if e.get("source") not in (None, "", "titre") else "metadata"}
+                        for e in (record.get("efk_excerpts_de") or []) + (record.get("efk_excerpts_fr") or [])]
+            if not snippets:
+                snippets = [{"text": "Bericht der Eidgenössischen Finanzkontrolle (EFK)",
+                             "source_name": "", "source_type": "metadata"}]
+            affair = {k: v for k, v in record.items()
+                      if k not in ("efk_documents", "efk_documents_de", "all_documents", "authors",
+                                   "efk_excerpts_fr", "efk_excerpts_de", "snippet_sources",
+                                   "author_display", "author_display_fr", "author_display_de",
+                                   "body_name", "body_name_fr", "body_name_original")}
+            affair["id"] = affair_id
+            affair["_search_meta"] = {"snippets": snippets}
+            recording["affairs"].append(affair)
+            recording["docs"][str(affair_id)] = [dict(d, id=d.get("id")) for d in docs]
+            recording["contributors"][str(affair_id)] = [{
+                "fullname": a.get("fullname", ""),
+                "firstname": a.get("firstname", ""),
+                "lastname": a.get("lastname", ""),
+                "party": {"fr": a.get("party_fr", ""), "de": a.get("party_de", "")}
+                         if a.get("role") != "author" else None,
+                "role_harmonized": a.get("role", ""),
+            } for a in record.get("authors") or []]
+            if record.get("body_key"):
+                recording["bodies"][record["body_key"]] = record.get("body_name_original") or record["body_key"]
+    return recording
+
+
+class StandIn(ThreadingHTTPServer):
+    """Local OpenParlData stand-in that counts requests and bytes per endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self, recording: Dict, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.recording = recording
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.search_text = {
+            affair["id"]: " ".join([str(affair.get(field) or "") for field in SEARCHED_FIELDS]
+                                   + [s["text"] for s in affair["_search_meta"]["snippets"]]).lower()
+            for affair in recording["affairs"]
+        }
+        self.sorted_affairs = sorted(recording["affairs"], key=lambda a: a.get("begin_date") or "", reverse=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, endpoint: str, size: int) -> None:
+        with self.lock:
+            entry = self.stats.setdefault(endpoint, {"requests": 0, "bytes": 0})
+            entry["requests"] += 1
+            entry["bytes"] += size
+
+    def search(self, query: Dict[str, List[str]]) -> Dict:
+        term = (query.get("search") or [""])[0].lower()
+        sort_by = (query.get("sort_by") or ["-begin_date"])[0]
+        limit = int((query.get("limit") or ["50"])[0])
+        offset = int((query.get("offset") or ["0"])[0])
+        affairs = self.sorted_affairs
+        if sort_by.lstrip("-") != "begin_date":
+            field = sort_by.lstrip("-")
+            affairs = sorted(affairs, key=lambda a: a.get(field) or "", reverse=sort_by.startswith("-"))
+        body_key = (query.get("body_key") or [None])[0]
+        matches = [a for a in affairs if term in self.search_text[a["id"]]
+                   and (body_key is None or a.get("body_key") == body_key)]
+        return {"data": matches[offset:offset + limit], "meta": {"total_records": len(matches)}}
+
+    def page(self, affair_id: str) -> str:
+        """Parliament page listing the affair authors as "Eingereicht von: Name, Name"."""
+        contributors = self.recording["contributors"].get(affair_id, [])
+        authors = ", ".join(c["fullname"] for c in contributors if c.get("fullname"))
+        return f"<html><body><h1>Geschäft {affair_id}</h1><p>Eingereicht von: {authors}</p></body></html>"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandIn
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        content_type = "application/json"
+        match = AFFAIR_PATH.match(url.path)
+        page = PAGE_PATH.match(url.path)
+        if url.path == "/v1/affairs/":
+            endpoint, payload = "affairs", self.server.search(query)
+        elif match:
+            endpoint = match.group(2)
+            payload = {"data": self.server.recording[endpoint].get(match.group(1), [])}
+        elif url.path == "/v1/bodies/":
+            endpoint = "bodies"
+            payload = {"data": [{"body_key": k, "name": v} for k, v in self.server.recording["bodies"].items()]}
+        elif page:
+            endpoint, payload, content_type = "pages", self.server.page(page.group(1)), "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        body = (payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)).encode("utf-8")
+        self.server.count(endpoint, len(body))
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_pipeline(base_url: str, output_dir: str, max_workers: int, verbose: bool) -> Dict:
+    """Run the pipeline stages against `base_url`.
+    Runs in a fresh (spawned) process, so its peak RSS is the pipeline's own."""
+    import fetch_cantonal_mentions as fcm
+
+    fcm.API_BASE = f"{base_url}/v1"
+    fcm.DELTA_DIR = os.path.join(output_dir, "deltas")
+    fcm.SEARCH_PLAN_FILE = os.path.join(output_dir, "search_plan.json")
+    fcm.configure_http(max_workers, requests_per_second=1000)
+    fcm.configure_cache(None)
+    fcm.configure_document_verification(False)
+
+    stages = {}
+    log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        def stage(name, function, *args):
+            start = time.perf_counter()
+            result = function(*args)
+            stages[name] = round(time.perf_counter() - start, 3)
+            return result
+
+        bodies = stage("fetch_body_info", fcm.fetch_body_info)
+        affairs = stage("fetch_all_federal_mentions", fcm.fetch_all_federal_mentions)
+        # Authors are scraped from the stand-in instead of the parliament sites
+        for affair in affairs:
+            for key in ("url_external", "url_external_de", "url_external_fr"):
+                if affair.get(key):
+                    affair[key] = f"{base_url}/pages/{affair['id']}"
+        affairs = stage("enrich_with_body_names", fcm.enrich_with_body_names, affairs, bodies)
+        affairs = stage("enrich_with_documents_and_authors", fcm.enrich_with_documents_and_authors, affairs)
+        stage("save_results", fcm.save_results, affairs, os.path.join(output_dir, "cantonal_efk_mentions.json"))
+
+    return {
+        "affairs": len(affairs),
+        "stages": stages,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of the cantonal pipeline")
+    parser.add_argument("--recording", help="JSON payloads to serve (default: rebuilt from cantonal_efk_mentions.json)")
+    parser.add_argument("--source", default=SOURCE_FILE, help="Output file to rebuild the payloads from")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the rebuilt affairs N times (default: 1)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Stand-in latency per request (default: 50)")
+    parser.add_argument("--max-workers", type=int, default=8, help="Affairs enriched in parallel (default: 8)")
+    parser.add_argument("--results", default=RESULTS_FILE, help="JSON file the run is appended to")
+    parser.add_argument("--no-save", action="store_true", help="Do not append the run to the results file")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline output")
+    args = parser.parse_args()
+
+    if args.recording:
+        with open(args.recording, "r", encoding="utf-8") as f:
+            recording = json.load(f)
+    else:
+        recording = build_recording(args.source, args.scale)
+
+    server = StandIn(recording, args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Stand-in on {server.base_url}: {len(recording['affairs'])} affairs, "
+          f"{args.latency_ms:.0f} ms latency, {args.max_workers} workers")
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as output_dir, ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        result = pool.submit(run_pipeline, server.base_url, output_dir, args.max_workers, args.verbose).result()
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "parameters": {"recording": args.recording, "scale": args.scale,
+                       "latency_ms": args.latency_ms, "max_workers": args.max_workers},
+        "wall_seconds": round(wall, 3),
+        **result,
+        "endpoints": dict(sorted(server.stats.items())),
+        "requests": sum(e["requests"] for e in server.stats.values()),
+        "bytes": sum(e["bytes"] for e in server.stats.values()),
+    }
+
+    print(f"\n{'stage':<40} {'seconds':>8}")
+    for name, seconds in run["stages"].items():
+        print(f"{name:<40} {seconds:>8.3f}")
+    print(f"\n{'endpoint':<40} {'requests':>8} {'KB':>8}")
+    for name, entry in run["endpoints"].items():
+        print(f"{name:<40} {entry['requests']:>8} {entry['bytes'] / 1024:>8.0f}")
+    print(f"\nWall time: {run['wall_seconds']:.2f}s, {run['requests']} requests, "
+          f"{run['bytes'] / 1024:.0f} KB, peak RSS {run['peak_rss_mb']} MB, {run['affairs']} affairs saved")
+
+    history = []
+    if os.path.exists(args.results):
+        with open(args.results, "r", encoding="utf-8") as f:
+            history = json.load(f).get("runs", [])
+    previous = next((r for r in reversed(history) if r.get("parameters") == run["parameters"]), None)
+    if previous:
+        change = (run["wall_seconds"] - previous["wall_seconds"]) / previous["wall_seconds"] * 100
+        print(f"Previous comparable run ({previous['timestamp']}, {previous['revision'] or '?'}): "
+              f"{previous['wall_seconds']:.2f}s ({change:+.0f}%), {previous['requests']} requests")
+
+    if not args.no_save:
+        with open(args.results, "w", encoding="utf-8") as f:
+            json.dump({"runs": history + [run]}, f, ensure_ascii=False, indent=2)
+        print(f"✓ Run appended to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
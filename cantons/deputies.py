@@ -0,0 +1,197 @@
+"""
+Party lookup for cantonal deputies and government members.
+All known deputies are indexed once in a DeputyRegistry: by normalized
+full name, by accent-folded name tokens, with a fuzzy fallback.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Optional
+
+BERN_DEPUTIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bern_deputies.json")
+
+# Minimum similarity (0-1) of two folded names for a fuzzy match
+FUZZY_CUTOFF = 0.9
+
+# Grisons deputies party mapping
+GRISONS_DEPUTIES_PARTIES = {
+    # Add deputies as needed when they appear in affairs
+}
+
+# Zug deputies party mapping
+ZUG_DEPUTIES_PARTIES = {
+    'Andreas Iten': 'PLR',
+    'Esther Haas': 'Les Verts',
+    'Luzian Franzini': 'ALG',  # Alternative - die Grünen
+    'Rita Hofer': 'PS',
+}
+
+# Vaud deputies party mapping
+VAUD_DEPUTIES_PARTIES = {
+    'Hadrien Buclin': 'Ensemble à Gauche',  # EàG-POP
+    'Rebecca Ruiz': 'PS',  # Conseillère d'État
+    'Vassilis Venizelos': 'Les Verts',  # Conseiller d'État
+    'Christelle Luisier': 'PLR',  # Conseillère d'État
+    'Isabelle Moret': 'PLR',  # Conseillère d'État
+    'Valérie Dittli': 'Le Centre',  # Conseillère d'État
+    'Frédéric Borloz': 'PLR',  # Conseiller d'État
+    'Pierre-Yves Maillard': 'PS',
+    'Ada Marra': 'PS',
+}
+
+# Fribourg deputies/government party mapping
+FRIBOURG_DEPUTIES_PARTIES = {
+    'Olivier Curty': 'Le Centre',  # Conseiller d'État
+    'Jean-François Steiert': 'PS',  # Conseiller d'État
+    'Didier Castella': 'Le Centre',  # Conseiller d'État
+    'Romain Collaud': 'PLR',  # Conseiller d'État
+    'Sylvie Bonvin-Sansonnens': 'Les Verts',  # Conseillère d'État
+    'Philippe Demierre': 'UDC',  # Conseiller d'État
+    'Sophie Tritten': 'Le Centre',  # Conseillère d'État
+}
+
+# Valais deputies party mapping (scraped from parlement.vs.ch)
+VALAIS_DEPUTIES_PARTIES = {
+    # Based on current Grand Council composition
+    'Blaise Melly': 'Le Centre',
+    'Andrea Amherd-Burgener': 'Le Centre',
+    'Emmanuel Revaz': 'Le Centre',
+    'Sonia Tauss-Cornut': 'PS',
+    'Anne-Laure Secco': 'PLR',
+    'Dina Studer': 'Les Verts',
+    'Rahel Pirovino-Indermitte': 'Le Centre',
+    'Aurel Schmid': 'UDC',
+    'Urs Juon': 'UDC',
+    'Damien Revaz': 'Le Centre',
+    'Florian Chappot': 'PLR',
+    'Diego Wellig': 'Le Centre',
+    'Franz Ruppen': 'UDC',
+    'Philipp Matthias Bregy': 'Le Centre',
+    'Beat Rieder': 'Le Centre',
+    'Mathias Reynard': 'PS',
+    'Roberto Schmidt': 'Le Centre',
+    'Christophe Darbellay': 'Le Centre',
+    'Frédéric Favre': 'PLR',
+}
+
+# Static party tables (FR labels) by canton body_key
+CANTON_DEPUTIES_PARTIES = {
+    "GR": GRISONS_DEPUTIES_PARTIES,
+    "ZG": ZUG_DEPUTIES_PARTIES,
+    "VD": VAUD_DEPUTIES_PARTIES,
+    "FR": FRIBOURG_DEPUTIES_PARTIES,
+    "VS": VALAIS_DEPUTIES_PARTIES,
+}
+
+# Party name translations (DE -> FR)
+PARTY_TRANSLATIONS = {
+    'FDP': 'PLR', 'SVP': 'UDC', 'SP': 'PS',
+    'CVP': 'PDC', 'Grüne': 'Les Verts', 'GLP': 'PVL',
+    'EVP': 'PEV', 'BDP': 'PBD', 'Mitte': 'Le Centre',
+    'Die Mitte': 'Le Centre', 'GPS': 'Les Verts',
+}
+PARTY_TRANSLATIONS_FR_DE = {v: k for k, v in PARTY_TRANSLATIONS.items()}
+
+
+def translate_party(party: str, lang: str) -> str:
+    """Party label in `lang` ("fr" or "de"); unknown labels are returned unchanged."""
+    table = PARTY_TRANSLATIONS if lang == "fr" else PARTY_TRANSLATIONS_FR_DE
+    return table.get(party, party)
+
+
+def fold_name(name: str) -> str:
+    """Lowercase, accent-free name with single spaces ("Frédéric\xa0Favre" -> "frederic favre")."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+
+def name_tokens(name: str) -> FrozenSet[str]:
+    """Accent-folded words of a name, ignoring order, hyphens and punctuation."""
+    return frozenset(t for t in re.split(r"\W+", fold_name(name)) if t)
+
+
+class DeputyRegistry:
+    """Deputies with their FR/DE party labels, indexed per canton.
+
+    lookup() tries, in order: the folded full name, the set of name tokens
+    (word order, hyphens), a unique candidate whose tokens contain or are
+    contained in the query, the last name, and finally the most similar
+    name among the candidates that share a token with the query. Each step
+    only touches the deputies indexed under the query's tokens, so a lookup
+    does not scan the whole list."""
+
+    def __init__(self, fuzzy_cutoff: float = FUZZY_CUTOFF):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._by_name: Dict[tuple, Dict] = {}
+        self._by_tokens: Dict[tuple, Dict] = {}
+        self._by_token: Dict[tuple, set] = defaultdict(set)
+        self._tokens: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def add(self, fullname: str, party_fr: str = "", party_de: str = "", canton: str = None) -> None:
+        folded = fold_name(fullname)
+        if not folded:
+            return
+        entry = {"fullname": fullname, "canton": canton, "party_fr": party_fr, "party_de": party_de}
+        self._by_name[(canton, folded)] = entry
+        tokens = self._tokens[folded] = name_tokens(fullname)
+        self._by_tokens[(canton, tokens)] = entry
+        for token in tokens:
+            self._by_token[(canton, token)].add(folded)
+
+    def lookup(self, fullname: str, canton: str = None, lastname: str = None) -> Optional[Dict]:
+        """Registry entry for `fullname` in `canton`, or None.
+        `lastname` enables a match on the last name alone when it is unique."""
+        folded = fold_name(fullname or "")
+        if not folded:
+            return None
+        entry = self._by_name.get((canton, folded))
+        if entry:
+            return entry
+        tokens = name_tokens(folded)
+        entry = self._by_tokens.get((canton, tokens))
+        if entry:
+            return entry
+
+        candidates = set()
+        for token in tokens:
+            candidates |= self._by_token.get((canton, token), set())
+        if not candidates:
+            return None
+
+        nested = [c for c in candidates if self._tokens[c] <= tokens or tokens <= self._tokens[c]]
+        if len(nested) == 1:
+            return self._by_name[(canton, nested[0])]
+
+        if lastname:
+            last_tokens = name_tokens(lastname)
+            same_lastname = [c for c in candidates if last_tokens and last_tokens <= self._tokens[c]]
+            if len(same_lastname) == 1:
+                return self._by_name[(canton, same_lastname[0])]
+
+        best, best_ratio = None, self.fuzzy_cutoff
+        for candidate in candidates:
+            ratio = SequenceMatcher(None, folded, candidate).ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = candidate, ratio
+        return self._by_name[(canton, best)] if best else None
+
+    @classmethod
+    def load(cls, bern_file: str = BERN_DEPUTIES_FILE) -> "DeputyRegistry":
+        """Registry of the static canton tables and the Bern deputies file."""
+        registry = cls()
+        for canton, parties in CANTON_DEPUTIES_PARTIES.items():
+            for fullname, party in parties.items():
+                registry.add(fullname, party, translate_party(party, "de"), canton)
+        if os.path.exists(bern_file):
+            with open(bern_file, "r", encoding="utf-8") as f:
+                for fullname, party in json.load(f).items():
+                    registry.add(fullname, party.get("fr", ""), party.get("de", ""), "BE")
+        return registry
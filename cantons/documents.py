@@ -0,0 +1,265 @@
+"""
+Content verification of affair documents.
+Documents (PDF, DOCX, HTML, plain text) are downloaded as streams to a
+spooled temporary file, their text is extracted piece by piece and the
+federal audit office classifier runs over a sliding window of that text.
+Verdicts are cached by document URL and content hash.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from html.parser import HTMLParser
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
+from urllib.parse import unquote, urlsplit
+from xml.etree.ElementTree import iterparse
+
+from fetch_http import RETRY_STATUSES, HostConcurrencyLimiter, HostRateLimiter, RequestScheduler, ResponseCache
+from metrics import Metrics
+from transport import ReplayMiss, Transport
+
+CHUNK_SIZE = 64 * 1024
+# Downloads are kept in memory up to SPOOL_MEMORY_BYTES, then spilled to disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+DEFAULT_MAX_DOCUMENT_BYTES = 50 * 1024 * 1024
+
+# Text is classified in windows of WINDOW_CHARS; consecutive windows overlap
+# so that a mention cut by a window boundary is still seen whole
+WINDOW_CHARS = 8000
+WINDOW_OVERLAP = 200
+
+DOCX_TEXT_TAG = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t"
+DOCX_PARAGRAPH_TAG = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}p"
+
+
+class UnsupportedDocument(Exception):
+    """The document type cannot be read (or its optional parser is missing)."""
+
+
+class _TextParser(HTMLParser):
+    """Incremental HTML to text: collects text outside script/style."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pieces = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.pieces.append(data)
+
+
+def _iter_decoded(f: BinaryIO, encoding: str = "utf-8") -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_html_text(f: BinaryIO) -> Iterator[str]:
+    parser = _TextParser()
+    for text in _iter_decoded(f):
+        parser.feed(text)
+        yield " ".join(parser.pieces)
+        parser.pieces.clear()
+    parser.close()
+    yield " ".join(parser.pieces)
+
+
+def iter_docx_text(f: BinaryIO) -> Iterator[str]:
+    with zipfile.ZipFile(f) as archive:
+        try:
+            document = archive.open("word/document.xml")
+        except KeyError:
+            raise UnsupportedDocument("zip file without word/document.xml")
+        with document:
+            for _, element in iterparse(document):
+                if element.tag == DOCX_TEXT_TAG and element.text:
+                    yield element.text
+                elif element.tag == DOCX_PARAGRAPH_TAG:
+                    yield "\n"
+                    element.clear()
+
+
+def iter_pdf_text(f: BinaryIO) -> Iterator[str]:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedDocument("pypdf is required to read PDF documents (pip install pypdf)")
+    for page in PdfReader(f).pages:
+        yield (page.extract_text() or "") + "\n"
+
+
+def iter_document_text(f: BinaryIO) -> Iterator[str]:
+    """Text of a document, piece by piece; the type is detected from its first bytes."""
+    head = f.read(8)
+    f.seek(0)
+    if head.startswith(b"%PDF"):
+        return iter_pdf_text(f)
+    if head.startswith(b"PK\x03\x04"):
+        return iter_docx_text(f)
+    if b"\x00" in head:
+        raise UnsupportedDocument("binary document")
+    return iter_html_text(f)
+
+
+def mentions_in_text(pieces: Iterator[str], classify: Callable[[str], bool]) -> bool:
+    """Run `classify` over overlapping windows of the text, stop at the first match."""
+    window = ""
+    for piece in pieces:
+        window += piece
+        while len(window) >= WINDOW_CHARS:
+            if classify(window[:WINDOW_CHARS]):
+                return True
+            window = window[WINDOW_CHARS - WINDOW_OVERLAP:]
+    return bool(window.strip()) and classify(window)
+
+
+class DocumentVerifier:
+    """Decides from their content whether documents mention the federal audit office.
+
+    With `fixtures_dir`, documents are read from that directory (by the file
+    name of their URL) instead of being downloaded. Verdicts are stored in
+    the `results` table of `cache` with the SHA-256 of the document; an
+    unchanged document is not extracted again, and when the server confirms
+    it with a 304 it is not even downloaded again. Downloads go through
+    `transport` (live by default) and `scheduler` (retries, Retry-After,
+    circuit breaker; `rate_limiter` alone without one), and are recorded in
+    `metrics` as the "document" endpoint."""
+
+    def __init__(self, classify: Callable[[str], bool], cache: ResponseCache = None,
+                 fixtures_dir: str = None, transport: Transport = None, metrics: Metrics = None,
+                 rate_limiter: HostRateLimiter = None, scheduler: RequestScheduler = None,
+                 host_limiter: HostConcurrencyLimiter = None,
+                 max_bytes: int = DEFAULT_MAX_DOCUMENT_BYTES, timeout: int = 60):
+        self.classify = classify
+        self.cache = cache
+        self.fixtures_dir = fixtures_dir
+        self.transport = transport or Transport()
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.host_limiter = host_limiter or HostConcurrencyLimiter()
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+    def fixture_path(self, url: str) -> str:
+        return os.path.join(self.fixtures_dir, unquote(os.path.basename(urlsplit(url).path)))
+
+    def _spool(self, chunks: Iterator[bytes]):
+        """Copy a byte stream to a spooled temporary file, return (file, sha256)."""
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            if size > self.max_bytes:
+                spooled.close()
+                raise UnsupportedDocument(f"larger than {self.max_bytes} bytes")
+            digest.update(chunk)
+            spooled.write(chunk)
+        spooled.seek(0)
+        return spooled, digest.hexdigest()
+
+    def _download(self, url: str, cached: Optional[Dict]):
+        """Return (spooled file, digest, validators), or None if `cached` is still current."""
+        if self.fixtures_dir:
+            with open(self.fixture_path(url), "rb") as f:
+                spooled, digest = self._spool(iter(lambda: f.read(CHUNK_SIZE), b""))
+            return spooled, digest, {}
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        start = time.perf_counter()
+
+        def send():
+            nonlocal start
+            start = time.perf_counter()
+            try:
+                response = self.transport.get(url, headers=headers, stream=True, timeout=self.timeout)
+            except Exception:
+                self._observe(start, "error")
+                raise
+            if response.status_code in RETRY_STATUSES:
+                self._observe(start, response.status_code)
+            return response
+
+        with self.host_limiter.slot(url):
+            if self.scheduler is not None:
+                response = self.scheduler.request(url, send, on_retry=self._retry)
+            else:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(url)
+                response = send()
+            with response:
+                if cached and response.status_code == 304:
+                    self._observe(start, 304)
+                    return None
+                response.raise_for_status()
+                spooled, digest = self._spool(response.iter_content(CHUNK_SIZE))
+                size = spooled.seek(0, os.SEEK_END)
+                spooled.seek(0)
+                self._observe(start, response.status_code, size)
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+        return spooled, digest, validators
+
+    def _retry(self, url: str) -> None:
+        if self.metrics is not None:
+            self.metrics.retry("document")
+
+    def _observe(self, start: float, status, size: int = 0) -> None:
+        if self.metrics is not None:
+            self.metrics.observe("document", time.perf_counter() - start, status, size)
+
+    def verify(self, doc: Dict) -> Optional[bool]:
+        """True if the document text mentions the federal audit office,
+        None if it could not be read."""
+        url = doc.get("url")
+        if not url:
+            return None
+
+        cached = None
+        if self.cache is not None:
+            last = self.cache.last_result(url)
+            if last:
+                cached = json.loads(last[1])
+
+        try:
+            download = self._download(url, cached)
+            if download is None:
+                return cached["federal"]
+            spooled, digest, validators = download
+            with spooled:
+                if cached and last[0] == digest:
+                    federal = cached["federal"]
+                else:
+                    federal = mentions_in_text(iter_document_text(spooled), self.classify)
+        except ReplayMiss:
+            raise
+        except Exception as e:
+            # download errors, unsupported types, malformed documents
+            if self.metrics is not None:
+                self.metrics.error("document", e)
+            return None
+
+        if self.cache is not None:
+            self.cache.put_result(url, digest, json.dumps(dict(validators, federal=federal)))
+        return federal
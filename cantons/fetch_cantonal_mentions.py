@@ -5,14 +5,79 @@ Excludes federal parliament (CHE) and cantonal audit offices.
 """
 
 import argparse
+import hashlib
+import importlib.util
+import os
 import requests
 import json
 import re
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from html import unescape
+from typing import List, Dict, Any, Callable, Iterator, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from deputies import DeputyRegistry, translate_party
+from documents import DocumentVerifier
+from metrics import Metrics
+from transport import MODES as TRANSPORT_MODES, ReplayMiss, Transport
+from output import AFFAIR_FIELDS, GENERATED_AT, describe_delta, project, write_delta, write_json
+from fetch_http import (
+    DEFAULT_MAX_PER_HOST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    AdaptiveConcurrency,
+    HostConcurrencyLimiter,
+    HostRateLimiter,
+    RequestScheduler,
+    ResponseCache,
+    map_bounded,
+)
 
 API_BASE = "https://api.openparldata.ch/v1"
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EXISTING_RESULTS_FILE = os.path.join(SCRIPT_DIR, "cantonal_efk_mentions.json")
+
+# State of the last --incremental run (updated_at high-water mark)
+SYNC_STATE_FILE = os.path.join(SCRIPT_DIR, "sync_state.json")
+
+# Added/changed/removed affair ids of each run (see output.write_delta)
+DELTA_DIR = os.path.join(SCRIPT_DIR, "deltas")
+
+# Concurrency settings (see configure_http)
+MAX_WORKERS = DEFAULT_MAX_WORKERS
+RATE_LIMITER = HostRateLimiter(DEFAULT_REQUESTS_PER_SECOND)
+
+# Persistent response cache (see configure_cache); None disables caching
+RESPONSE_CACHE = None
+DEFAULT_CACHE_FILE = os.path.join(SCRIPT_DIR, ".http_cache.sqlite")
+
+# Outbound HTTP: live, record or replay (see configure_transport)
+TRANSPORT = Transport()
+DEFAULT_ARCHIVE_FILE = os.path.join(SCRIPT_DIR, ".http_archive.sqlite")
+
+# Stage timings and per-endpoint request metrics of the run (see metrics.py)
+METRICS = Metrics("cantonal_mentions")
+DEFAULT_METRICS_FILE = os.path.join(SCRIPT_DIR, "run_metrics.json")
+
+# Optional content verification of affair documents (see configure_document_verification)
+DOCUMENT_VERIFIER = None
+MAX_VERIFIED_DOCUMENTS = 5  # per affair
+
+# Cache lifetimes in seconds by URL fragment (first match wins). Expired
+# entries are revalidated with ETag / Last-Modified when available.
+HOUR = 3600
+DAY = 24 * HOUR
+CACHE_TTLS = [
+    ("/bodies/", 14 * DAY),
+    ("/contributors/", 7 * DAY),
+    ("/docs/", 3 * DAY),
+    ("/affairs/", 12 * HOUR),  # searches
+]
+DEFAULT_CACHE_TTL = 7 * DAY  # scraped parliament pages
+
 # Search terms for the FEDERAL audit office - more specific queries
 SEARCH_TERMS_FEDERAL = [
     # German - full terms (most reliable)
@@ -31,6 +96,21 @@ SEARCH_TERMS_FEDERAL = [
     "Controllo federale delle finanze",
 ]
 
+# French terms searched in the bilingual cantons only, for French snippets
+SEARCH_TERMS_BILINGUAL_FR = [
+    "Contrôle fédéral des finances",
+    "Contrôle fédéral",
+    "contrôle des finances",
+    "rapport du CDF",
+    "CDF",
+]
+
+# Term-to-result overlap of the last measuring search pass (see plan_searches)
+SEARCH_PLAN_FILE = os.path.join(SCRIPT_DIR, "search_plan.json")
+
+# Page size for /affairs/ searches (results are paged until exhausted)
+SEARCH_PAGE_SIZE = 200
+
 # Federal parliament body key to exclude
 FEDERAL_BODY_KEY = "CHE"
 
@@ -126,6 +206,261 @@ EXCLUDE_PATTERNS = [
     r"Briefkastenfirm",
 ]
 
+# Lowercase literals gating the pattern families: a text can only match
+# EXCLUDE_PATTERNS / FEDERAL_PATTERNS if it contains one of these. Keep them
+# in sync with the patterns (MentionClassifier checks each pattern has one).
+EXCLUDE_TRIGGERS = ["finanzkontrolle", "contrôle", "controllo", "briefk", "stiefkind"]
+FEDERAL_TRIGGERS = ["finanzkontrolle", "efk", "contrôle", "cdf", "controllo"]
+
+# Keywords (lowercase substrings) showing that a snippet mentions EFK/CDF
+EFK_KEYWORDS = [
+    "eidgenössische finanzkontrolle", "eidgenössischen finanzkontrolle",
+    "finanzkontrolle des bundes", "efk", "efk-bericht", "efk-prüfung",
+    "contrôle fédéral des finances", "cdf", "rapport du cdf",
+    "controllo federale delle finanze",
+]
+
+# Keywords used to guess the language of a snippet
+LANGUAGE_KEYWORDS_FR = ["Contrôle", "fédéral", "finances", "rapport", "conformément",
+                        "recommandations", "audit", "prochaines", "également"]
+LANGUAGE_KEYWORDS_DE = ["Finanzkontrolle", "eidgenössisch", "Prüfung", "Bericht",
+                        "gemäss", "Empfehlungen", "Kontrolle", "ebenfalls"]
+
+
+class MentionClassifier:
+    """Precompiled classifier for EFK/CDF mentions.
+
+    `classify` lowercases the text once and looks up every keyword and
+    trigger literal in it. The exclusion and federal patterns are each
+    folded into one compiled alternation, and only run when one of their
+    trigger literals is present, which skips the regex engine entirely
+    for most snippets and document names.
+    """
+
+    def __init__(self, federal_patterns: List[str], exclude_patterns: List[str],
+                 efk_keywords: List[str], keywords_fr: List[str], keywords_de: List[str],
+                 federal_triggers: List[str], exclude_triggers: List[str]):
+        for patterns, triggers in ((federal_patterns, federal_triggers),
+                                   (exclude_patterns, exclude_triggers)):
+            for pattern in patterns:
+                if not any(t in pattern.lower() for t in triggers):
+                    raise ValueError(f"No trigger literal for pattern {pattern!r}")
+        
+        self.exclude_re = re.compile("|".join(f"(?:{p})" for p in exclude_patterns), re.IGNORECASE)
+        self.federal_re = re.compile("|".join(f"(?:{p})" for p in federal_patterns), re.IGNORECASE)
+        
+        # literal -> set of tags; one lookup table for every substring test
+        self.literal_tags = {}
+        for tag, literals in (("efk", efk_keywords), ("fr", keywords_fr), ("de", keywords_de),
+                              ("federal", federal_triggers), ("exclude", exclude_triggers)):
+            for literal in literals:
+                self.literal_tags.setdefault(literal.lower(), set()).add(tag)
+        self.literals = list(self.literal_tags)
+    
+    def _tags(self, text_lower: str) -> Dict[str, int]:
+        """Count, per tag, the distinct literals occurring in text_lower."""
+        counts = {"efk": 0, "fr": 0, "de": 0, "federal": 0, "exclude": 0}
+        for literal in self.literals:
+            if literal in text_lower:
+                for tag in self.literal_tags[literal]:
+                    counts[tag] += 1
+        return counts
+    
+    def _excluded(self, text: str, counts: Dict[str, int]) -> bool:
+        return counts["exclude"] > 0 and self.exclude_re.search(text) is not None
+    
+    def _federal(self, text: str, counts: Dict[str, int], excluded: bool) -> bool:
+        return not excluded and counts["federal"] > 0 and self.federal_re.search(text) is not None
+    
+    @staticmethod
+    def _language(counts: Dict[str, int]) -> str:
+        if counts["fr"] > counts["de"]:
+            return "fr"
+        elif counts["de"] > counts["fr"]:
+            return "de"
+        return "unknown"
+    
+    def is_excluded(self, text: str) -> bool:
+        """Check if text mentions a cantonal/municipal audit office or a known false positive."""
+        return bool(text) and self._excluded(text, self._tags(text.lower()))
+    
+    def is_federal(self, text: str) -> bool:
+        """Check if text explicitly mentions the FEDERAL audit office."""
+        return self.classify(text)["federal"]
+    
+    def mentions_efk(self, text: str) -> bool:
+        """Check if snippet text actually mentions EFK/CDF."""
+        return self.classify(text)["mentions_efk"]
+    
+    def language(self, text: str) -> str:
+        """Guess if a snippet is French or German from keyword counts."""
+        return self.classify(text)["language"]
+    
+    def classify(self, text: str) -> Dict[str, Any]:
+        """Answer every question about a text at once."""
+        if not text:
+            return {"excluded": False, "federal": False, "mentions_efk": False, "language": "unknown"}
+        counts = self._tags(text.lower())
+        excluded = self._excluded(text, counts)
+        return {
+            "excluded": excluded,
+            "federal": self._federal(text, counts, excluded),
+            "mentions_efk": counts["efk"] > 0,
+            "language": self._language(counts),
+        }
+
+
+CLASSIFIER = MentionClassifier(FEDERAL_PATTERNS, EXCLUDE_PATTERNS, EFK_KEYWORDS,
+                               LANGUAGE_KEYWORDS_FR, LANGUAGE_KEYWORDS_DE,
+                               FEDERAL_TRIGGERS, EXCLUDE_TRIGGERS)
+
+
+def configure_http(max_workers: int = DEFAULT_MAX_WORKERS,
+                   requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                   max_per_host: int = DEFAULT_MAX_PER_HOST,
+                   max_retries: int = DEFAULT_MAX_RETRIES) -> None:
+    """Set the number of affairs enriched in parallel, the per-host request rate,
+    the number of parliament pages scraped at once from the same host and the
+    retries of a failed request."""
+    global MAX_WORKERS, RATE_LIMITER, SCRAPE_HOSTS, SCHEDULER
+    MAX_WORKERS = max(1, max_workers)
+    RATE_LIMITER = HostRateLimiter(requests_per_second)
+    SCRAPE_HOSTS = HostConcurrencyLimiter(max_per_host)
+    SCHEDULER = make_scheduler(RATE_LIMITER, MAX_WORKERS, max_retries)
+
+
+def make_scheduler(rate_limiter: HostRateLimiter, max_workers: int, max_retries: int) -> RequestScheduler:
+    return RequestScheduler(rate_limiter, max_retries=max_retries,
+                            concurrency=AdaptiveConcurrency(initial=min(4, max_workers), maximum=max_workers),
+                            on_retry=lambda url: METRICS.retry(endpoint_name(url)))
+
+
+# Retries, circuit breaker and adaptive concurrency of live requests (see configure_http)
+SCHEDULER = make_scheduler(RATE_LIMITER, MAX_WORKERS, DEFAULT_MAX_RETRIES)
+
+
+def configure_cache(path: str = DEFAULT_CACHE_FILE) -> None:
+    """Enable the persistent response cache (path=None disables it)."""
+    global RESPONSE_CACHE
+    if RESPONSE_CACHE is not None:
+        RESPONSE_CACHE.close()
+    RESPONSE_CACHE = ResponseCache(path) if path else None
+
+
+def configure_transport(mode: str = "live", archive_path: str = DEFAULT_ARCHIVE_FILE) -> None:
+    """Send requests to the network ("live"), also archive the responses
+    ("record") or answer them from the archive only ("replay")."""
+    global TRANSPORT
+    TRANSPORT.close()
+    TRANSPORT = Transport(mode, archive_path)
+
+
+def configure_document_verification(enabled: bool = True, fixtures_dir: str = None) -> None:
+    """Check the text of affair documents when their names do not reveal a mention.
+    Uses the response cache (if enabled) to remember verdicts and the transport to
+    download; call after configure_http, configure_cache and configure_transport."""
+    global DOCUMENT_VERIFIER
+    DOCUMENT_VERIFIER = None
+    if enabled:
+        DOCUMENT_VERIFIER = DocumentVerifier(is_federal_audit_mention, cache=RESPONSE_CACHE,
+                                             fixtures_dir=fixtures_dir, transport=TRANSPORT, metrics=METRICS,
+                                             scheduler=None if TRANSPORT.offline else SCHEDULER,
+                                             host_limiter=SCRAPE_HOSTS)
+
+
+def cache_ttl(url: str) -> int:
+    """Return the cache lifetime for a URL."""
+    for fragment, ttl in CACHE_TTLS:
+        if fragment in url:
+            return ttl
+    return DEFAULT_CACHE_TTL
+
+
+def response_from_cache(url: str, entry: Dict) -> requests.Response:
+    """Build a requests.Response from a cache entry."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = entry["body"]
+    if entry.get("content_type"):
+        response.headers["Content-Type"] = entry["content_type"]
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def endpoint_name(url: str) -> str:
+    """Metrics label of a request: search, docs, contributors, bodies or scrape."""
+    parts = urlsplit(url)
+    if parts.netloc != urlsplit(API_BASE).netloc:
+        return "scrape"
+    if parts.path.endswith("/docs/"):
+        return "docs"
+    if parts.path.endswith("/contributors/"):
+        return "contributors"
+    if parts.path.endswith("/bodies/"):
+        return "bodies"
+    if parts.path.endswith("/affairs/"):
+        return "search"
+    return "api"
+
+
+def network_get(url: str, params: Dict = None, headers: Dict = None, timeout: int = 30) -> requests.Response:
+    """GET through the transport, with metrics for every attempt. Live requests go
+    through the shared scheduler (rate limit, retries, circuit breaker)."""
+    endpoint = endpoint_name(url)
+
+    def send() -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = TRANSPORT.get(url, params=params, headers=headers, timeout=timeout)
+        except Exception:
+            METRICS.observe(endpoint, time.perf_counter() - start, "error")
+            raise
+        METRICS.observe(endpoint, time.perf_counter() - start, response.status_code, len(response.content))
+        return response
+
+    if TRANSPORT.offline:
+        return send()
+    return SCHEDULER.request(url, send)
+
+
+def http_get(url: str, params: Dict = None, timeout: int = 30) -> requests.Response:
+    """GET through the response cache, then network_get(). The cache is
+    bypassed when recording or replaying, so every response is archived and
+    a replay only depends on the archive."""
+    cache = RESPONSE_CACHE
+    if cache is None or TRANSPORT.mode != "live":
+        return network_get(url, params=params, timeout=timeout)
+    
+    key = cache.make_key(url, params)
+    entry = cache.get(key)
+    headers = {}
+    if entry:
+        if time.time() - entry["stored_at"] < cache_ttl(url):
+            cache.record_hit(len(entry["body"]))
+            METRICS.cache_hit(endpoint_name(url))
+            return response_from_cache(url, entry)
+        # Expired: ask the server whether our copy is still current
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+    
+    response = network_get(url, params=params, headers=headers, timeout=timeout)
+    
+    if entry and response.status_code == 304:
+        cache.touch(key)
+        cache.record_hit(len(entry["body"]), revalidated=True)
+        return response_from_cache(url, entry)
+    
+    cache.record_miss()
+    if response.status_code == 200:
+        cache.put(key, response.content,
+                  etag=response.headers.get("ETag"),
+                  last_modified=response.headers.get("Last-Modified"),
+                  content_type=response.headers.get("Content-Type"))
+    return response
+
 
 def should_exclude_affair(affair: Dict) -> bool:
     """Check if affair should be excluded (not relevant EFK mention)."""
@@ -164,43 +499,94 @@ def should_exclude_affair(affair: Dict) -> bool:
 
 def is_federal_audit_mention(text: str) -> bool:
     """Check if text explicitly mentions the FEDERAL audit office."""
-    if not text:
-        return False
-    
-    # First check for exclusion patterns
-    for pattern in EXCLUDE_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return False
-    
-    # Must match a federal-specific pattern
-    for pattern in FEDERAL_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    
-    return False
+    return CLASSIFIER.is_federal(text)
 
 
-def fetch_affairs_by_term(search_term: str, limit: int = 200) -> List[Dict]:
-    """Fetch affairs matching a search term, excluding federal parliament."""
+def iter_search_pages(params: Dict, since: str = None, page_size: int = SEARCH_PAGE_SIZE,
+                      sort_by: str = "-begin_date") -> Iterator[List[Dict]]:
+    """Yield pages of affairs for an /affairs/ search, following the API pagination.
+
+    Pages are requested with `limit`/`offset`; when the response carries a
+    `meta.next_page` link it is followed instead. The offset advances by the
+    rows received, since the server may cap pages below `page_size`, and
+    paging stops at an empty page or once `meta.total_records` rows were
+    requested. Results are sorted by
+    `sort_by` (descending), so with `since` (a date or timestamp prefix) on
+    that field, affairs older than the floor are dropped and paging stops at
+    the first one. If the API does not honour the sort order, paging goes on
+    to the end and the floor is only used as a filter.
+    Errors are printed and end the iteration.
+    """
     url = f"{API_BASE}/affairs/"
+    search_term = params.get("search", "")
+    params = dict(params, limit=page_size, offset=0, sort_by=sort_by)
+    field = sort_by.lstrip("-")
+    fetched = 0
+    sorted_ok = True
+    previous = None
+    
+    while url:
+        try:
+            response = http_get(url, params=params, timeout=60)
+            response.raise_for_status()
+            data = response.json()
+        except ReplayMiss:
+            raise
+        except Exception as e:
+            METRICS.error("search", e)
+            print(f"  Error fetching '{search_term}' (after {fetched} results): {e}")
+            return
+        
+        page = data.get("data", [])
+        fetched += len(page)
+        reached_floor = False
+        if since:
+            values = [a[field] for a in page if a.get(field)]
+            for value in values:
+                if previous is not None and value > previous:
+                    sorted_ok = False
+                previous = value
+            page = [a for a in page if not a.get(field) or a[field][:len(since)] >= since]
+            reached_floor = sorted_ok and any(v[:len(since)] < since for v in values)
+        
+        if page:
+            yield page
+        
+        if reached_floor or not data.get("data"):
+            return
+        
+        meta = data.get("meta") or {}
+        next_page = meta.get("next_page")
+        if next_page:
+            # The link already carries every query parameter
+            url, params = next_page, None
+        elif params is not None:
+            offset = params["offset"] + len(data["data"])
+            total = meta.get("total_records")
+            if isinstance(total, int) and offset >= total:
+                return
+            params = dict(params, offset=offset)
+        else:
+            return
+
+
+def iter_affairs_by_term(search_term: str, since: str = None,
+                         sort_by: str = "-begin_date") -> Iterator[Dict]:
+    """Stream all affairs matching a search term, page by page."""
     params = {
         "search": search_term,
         "search_mode": "partial",
         "search_scope": "metadata,docs",
-        "limit": limit,
-        "sort_by": "-begin_date",
         "lang_format": "flat",
         "hide_null": "true",
     }
-    
-    try:
-        response = requests.get(url, params=params, timeout=60)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("data", [])
-    except Exception as e:
-        print(f"  Error fetching '{search_term}': {e}")
-        return []
+    for page in iter_search_pages(params, since=since, sort_by=sort_by):
+        yield from page
+
+
+def fetch_affairs_by_term(search_term: str, since: str = None) -> List[Dict]:
+    """Fetch affairs matching a search term, excluding federal parliament."""
+    return list(iter_affairs_by_term(search_term, since=since))
 
 
 def get_snippets_text(affair: Dict) -> str:
@@ -210,109 +596,218 @@ def get_snippets_text(affair: Dict) -> str:
     return " ".join(s.get("text", "") for s in snippets)
 
 
-def fetch_french_snippets_for_bilingual(affairs: List[Dict]) -> None:
-    """Fetch French snippets specifically for bilingual cantons (VS, FR)."""
-    print("\nFetching French snippets for bilingual cantons...")
-    
-    # French search terms (broader to catch more VS/FR affairs)
-    fr_terms = [
-        "Contrôle fédéral des finances",
-        "Contrôle fédéral",
-        "contrôle des finances",
-        "rapport du CDF",
-        "CDF",
-    ]
-    
-    # Get affair IDs for bilingual cantons
-    bilingual_ids = {a["id"]: a for a in affairs if a.get("body_key") in BILINGUAL_CANTONS_FR}
-    
-    if not bilingual_ids:
-        return
-    
-    for term in fr_terms:
-        url = f"{API_BASE}/affairs/"
-        params = {
-            "search": term,
-            "search_mode": "partial",
-            "limit": 200,
-            "sort_by": "-begin_date",
-            "lang_format": "flat",
-        }
-        
-        try:
-            response = requests.get(url, params=params, timeout=60)
-            response.raise_for_status()
-            data = response.json()
-            
-            for affair in data.get("data", []):
-                affair_id = affair.get("id")
-                if affair_id in bilingual_ids:
-                    # Update with French snippets
-                    search_meta = affair.get("_search_meta", {})
-                    snippets = search_meta.get("snippets", [])
-                    if snippets:
-                        # Store French snippets
-                        if "_search_meta_fr" not in bilingual_ids[affair_id]:
-                            bilingual_ids[affair_id]["_search_meta_fr"] = {"snippets": []}
-                        bilingual_ids[affair_id]["_search_meta_fr"]["snippets"].extend(snippets)
-                        
-        except Exception as e:
-            print(f"  Error searching '{term}': {e}")
-    
-    # Update affairs with French snippets
-    for affair_id, affair in bilingual_ids.items():
-        if "_search_meta_fr" in affair:
-            affair["_search_meta"] = affair["_search_meta_fr"]
-            del affair["_search_meta_fr"]
-            print(f"  ✓ Updated FR snippets for affair {affair_id}")
+def term_words(term: str) -> List[str]:
+    return re.findall(r"\w+", term.casefold())
+
+
+def subsumes(broad: str, narrow: str) -> bool:
+    """True if every affair matching `narrow` also matches `broad`: the words
+    of `broad` appear, in order and side by side, among those of `narrow`."""
+    broad_words, narrow_words = term_words(broad), term_words(narrow)
+    return any(narrow_words[i:i + len(broad_words)] == broad_words
+               for i in range(len(narrow_words) - len(broad_words) + 1))
+
+
+def merge_terms(terms: List[str]) -> List[str]:
+    """Drop the terms whose results are a subset of another term's (see subsumes)."""
+    merged = []
+    for i, term in enumerate(terms):
+        if not any(subsumes(other, term) and (not subsumes(term, other) or j < i)
+                   for j, other in enumerate(terms) if j != i):
+            merged.append(term)
+    return merged
+
+
+def load_search_plan(filename: str = SEARCH_PLAN_FILE) -> Optional[Dict]:
+    if not os.path.exists(filename):
+        return None
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def federal_search_params(term: str) -> Dict:
+    return {
+        "search": term,
+        "search_mode": "partial",
+        "search_scope": "metadata,docs",
+        "lang_format": "flat",
+        "hide_null": "true",
+    }
+
 
+def search_total(term: str) -> Optional[int]:
+    """Number of affairs matching a federal term (one result requested),
+    None if the API does not report it or the request fails."""
+    try:
+        response = http_get(f"{API_BASE}/affairs/", params=dict(federal_search_params(term), limit=1), timeout=60)
+        response.raise_for_status()
+        total = (response.json().get("meta") or {}).get("total_records")
+    except ReplayMiss:
+        raise
+    except Exception as e:
+        METRICS.error("search", e)
+        return None
+    return total if isinstance(total, int) else None
+
+
+def plan_searches(state: Optional[Dict], all_terms: bool = False,
+                  count: Callable[[str], Optional[int]] = search_total) -> Tuple[List[Dict], bool]:
+    """Queries of the search pass and whether the pass measures the term overlap.
+
+    Federal terms are merged (merge_terms), then the terms found redundant
+    by the last measurement are dropped, as long as their result counts
+    (`count`, one cheap request per dropped term) are still those of the
+    measurement. Without a measurement, when a count changed or with
+    `all_terms`, every term is searched again to update it; the scheduled
+    workflow passes --all-search-terms once a month for that. French terms are searched in the bilingual cantons
+    only (one query per body_key) for their snippets; they are not merged,
+    since each term yields snippets of its own."""
+    federal_terms = merge_terms(SEARCH_TERMS_FEDERAL)
+    measure = (all_terms or not state or set(state.get("kept", {})) != set(federal_terms))
+    if not measure:
+        redundant = [term for term in federal_terms if term in state.get("redundant", [])]
+        changed = [term for term in redundant if count(term) != state.get("totals", {}).get(term)]
+        if changed:
+            print(f"  Result count changed for {', '.join(changed)}: searching every term")
+            measure = True
+        else:
+            federal_terms = [term for term in federal_terms if term not in redundant]
+
+    queries = [{"kind": "federal", "term": term, "params": federal_search_params(term)}
+               for term in federal_terms]
+    queries += [{"kind": "bilingual", "term": term, "params": {
+        "search": term,
+        "search_mode": "partial",
+        "lang_format": "flat",
+        "body_key": body_key,
+    }} for term in SEARCH_TERMS_BILINGUAL_FR for body_key in sorted(BILINGUAL_CANTONS_FR)]
+    return queries, measure
+
+
+def measure_term_overlap(kept_by_term: Dict[str, Set]) -> Dict:
+    """Term-to-result overlap of the federal terms: ids kept by each term, how
+    many no other term found, and the terms whose kept ids are all covered by
+    the others (greedy cover, largest terms first)."""
+    kept = {term: set(ids) for term, ids in kept_by_term.items()}
+    covered = set()
+    redundant = []
+    for term in sorted(kept, key=lambda t: -len(kept[t])):
+        if kept[term] - covered:
+            covered |= kept[term]
+        else:
+            redundant.append(term)
+    terms = {}
+    for term, ids in kept.items():
+        others = set().union(*(other for t, other in kept.items() if t != term))
+        terms[term] = {"kept": len(ids), "unique": len(ids - others)}
+    return {
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+        "terms": terms,
+        "redundant": [term for term in SEARCH_TERMS_FEDERAL if term in redundant],
+        "kept": {term: sorted(ids, key=str) for term, ids in kept.items()},
+    }
 
-def fetch_all_federal_mentions() -> List[Dict]:
-    """Fetch all cantonal mentions of the federal audit office."""
+
+def save_search_plan(state: Dict, filename: str = SEARCH_PLAN_FILE) -> None:
+    """Save the measurement; an unchanged overlap leaves the file as it is."""
+    if write_json(filename, state, volatile=[("measured_at",)], compress=False):
+        print(f"✓ Search term overlap saved ({len(state['redundant'])} redundant term(s))")
+    else:
+        print(f"✓ Search term overlap unchanged ({len(state['redundant'])} redundant term(s))")
+
+
+def merge_snippets(snippets: List[Dict], new: List[Dict]) -> None:
+    seen = {s.get("text") for s in snippets}
+    snippets.extend(s for s in new if s.get("text") not in seen and not seen.add(s.get("text")))
+
+
+def fetch_all_federal_mentions(since: str = None, sort_by: str = "-begin_date",
+                               all_terms: bool = False) -> List[Dict]:
+    """Fetch all cantonal mentions of the federal audit office in one search pass.
+    Search results are consumed as a stream; only matching affairs are kept.
+    With `since`, paging stops at affairs older than that value of the
+    `sort_by` field (begin_date by default, updated_at for --incremental).
+    The pass also collects French snippets for the bilingual cantons (VS, FR),
+    which replace the German ones of their affairs (see plan_searches).
+    A pass that measures the term overlap ignores `since`: the overlap is
+    only valid over every affair. With --incremental the unchanged affairs
+    are still reused as they are (see split_unchanged)."""
+    plan_state = load_search_plan(SEARCH_PLAN_FILE)
+    queries, measure = plan_searches(plan_state, all_terms)
+    if measure:
+        since = None
+    print(f"  {len(queries)} search queries"
+          + (" (measuring term overlap, no date floor)" if measure else ""))
     all_affairs = {}
+    kept_by_term = {q["term"]: set() for q in queries if q["kind"] == "federal"}
+    fr_snippets = {}
     
-    for term in SEARCH_TERMS_FEDERAL:
-        print(f"Searching for: {term}")
-        affairs = fetch_affairs_by_term(term)
-        print(f"  → {len(affairs)} results")
+    for query in queries:
+        term = query["term"]
+        bilingual = query["kind"] == "bilingual"
+        print(f"Searching for: {term}" + (f" [{query['params']['body_key']}]" if bilingual else ""))
+        result_count = 0
         
-        for affair in affairs:
-            affair_id = affair.get("id")
-            body_key = affair.get("body_key", "")
-            
-            # Skip federal parliament and already seen affairs
-            if body_key == FEDERAL_BODY_KEY or affair_id in all_affairs:
-                continue
-            
-            # Skip excluded affairs (not relevant EFK mentions)
-            if should_exclude_affair(affair):
-                continue
-            
-            # Skip if already found
-            if affair_id in all_affairs:
-                continue
-            
-            # Combine all text fields for analysis
-            title_de = affair.get("title_de", "") or ""
-            title_fr = affair.get("title_fr", "") or ""
-            title_it = affair.get("title_it", "") or ""
-            title_long_de = affair.get("title_long_de", "") or ""
-            title_long_fr = affair.get("title_long_fr", "") or ""
-            snippets_text = get_snippets_text(affair)
-            
-            full_text = f"{title_de} {title_fr} {title_it} {title_long_de} {title_long_fr} {snippets_text}"
-            
-            # Check if it's actually about the FEDERAL audit office
-            if is_federal_audit_mention(full_text):
-                all_affairs[affair_id] = affair
-                display_title = title_de or title_fr or title_it
-                print(f"  ✓ [{body_key}] {display_title[:80]}...")
+        for page in iter_search_pages(query["params"], since=since, sort_by=sort_by):
+            for affair in page:
+                result_count += 1
+                affair_id = affair.get("id")
+                body_key = affair.get("body_key", "")
+                
+                if bilingual:
+                    merge_snippets(fr_snippets.setdefault(affair_id, []),
+                                   affair.get("_search_meta", {}).get("snippets", []))
+                    continue
+                
+                # Already kept: only record the overlap
+                if affair_id in all_affairs:
+                    kept_by_term[term].add(affair_id)
+                    continue
+                
+                # Skip federal parliament
+                if body_key == FEDERAL_BODY_KEY:
+                    continue
+                
+                # Skip excluded affairs (not relevant EFK mentions)
+                if should_exclude_affair(affair):
+                    continue
+                
+                # Combine all text fields for analysis
+                title_de = affair.get("title_de", "") or ""
+                title_fr = affair.get("title_fr", "") or ""
+                title_it = affair.get("title_it", "") or ""
+                title_long_de = affair.get("title_long_de", "") or ""
+                title_long_fr = affair.get("title_long_fr", "") or ""
+                snippets_text = get_snippets_text(affair)
+                
+                full_text = f"{title_de} {title_fr} {title_it} {title_long_de} {title_long_fr} {snippets_text}"
+                
+                # Check if it's actually about the FEDERAL audit office
+                if is_federal_audit_mention(full_text):
+                    all_affairs[affair_id] = affair
+                    kept_by_term[term].add(affair_id)
+                    display_title = title_de or title_fr or title_it
+                    print(f"  ✓ [{body_key}] {display_title[:80]}...")
+        
+        print(f"  → {result_count} results")
+    
+    # French snippets for the bilingual cantons
+    for affair_id, affair in all_affairs.items():
+        if affair.get("body_key") in BILINGUAL_CANTONS_FR and fr_snippets.get(affair_id):
+            affair["_search_meta"] = {"snippets": fr_snippets[affair_id]}
+            print(f"  ✓ Updated FR snippets for affair {affair_id}")
+    
+    if measure:
+        plan_state = measure_term_overlap(kept_by_term)
+        # Result counts checked before skipping the redundant terms (see plan_searches)
+        plan_state["totals"] = {term: search_total(term) for term in plan_state["redundant"]}
+        save_search_plan(plan_state, SEARCH_PLAN_FILE)
     
     return list(all_affairs.values())
 
 
-def fetch_affair_docs(affair_id: int) -> List[Dict]:
-    """Fetch documents for a specific affair."""
+def fetch_affair_docs(affair_id: int) -> Optional[List[Dict]]:
+    """Fetch documents for a specific affair (None if the request failed)."""
     url = f"{API_BASE}/affairs/{affair_id}/docs/"
     params = {
         "limit": 50,
@@ -320,165 +815,150 @@ def fetch_affair_docs(affair_id: int) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         return data.get("data", [])
+    except ReplayMiss:
+        raise
     except Exception as e:
-        return []
+        METRICS.error("docs", e)
+        return None
 
 
-def fetch_affair_contributors(affair_id: int) -> List[Dict]:
-    """Fetch contributors (authors) for a specific affair."""
+def fetch_affair_contributors(affair_id: int) -> Optional[List[Dict]]:
+    """Fetch contributors (authors) for a specific affair (None if the request failed)."""
     url = f"{API_BASE}/affairs/{affair_id}/contributors/"
     params = {
         "lang_format": "flat",
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = http_get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         return data.get("data", [])
+    except ReplayMiss:
+        raise
     except Exception as e:
-        return []
+        METRICS.error("contributors", e)
+        return None
 
 
-# Grisons deputies party mapping
-GRISONS_DEPUTIES_PARTIES = {
-    # Add deputies as needed when they appear in affairs
-}
+# All known deputies, indexed once (see deputies.py)
+DEPUTIES = DeputyRegistry.load()
 
-# Zug deputies party mapping
-ZUG_DEPUTIES_PARTIES = {
-    'Andreas Iten': 'PLR',
-    'Esther Haas': 'Les Verts',
-    'Luzian Franzini': 'ALG',  # Alternative - die Grünen
-    'Rita Hofer': 'PS',
-}
+# Author scraping: lxml is much faster than html.parser when installed
+SCRAPE_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+SCRAPE_HOSTS = HostConcurrencyLimiter(DEFAULT_MAX_PER_HOST)
+AUTHOR_WITH_PARTY_PATTERN = re.compile(r'^(.+?)\s*\(([^)]+)\)$')
+AUTHOR_LABELS = ("Auteur", "Eingereicht von", "Autor")
+# "Auteur: Name (Party)" first, then "Auteur: Name"
+AUTHOR_LABEL_PATTERNS = [
+    re.compile(r'(?:Auteur|Eingereicht von|Autor)[:\s]+([^(]+)\s*\(([^)]+)\)'),
+    re.compile(r'(?:Auteur|Eingereicht von|Autor)[:\s]+([^\n(]+)'),
+]
+HTML_SKIPPED_PATTERN = re.compile(
+    r'<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>|<![^>]*>|<\?[^>]*>',
+    re.DOTALL | re.IGNORECASE,
+)
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
 
-# Vaud deputies party mapping
-VAUD_DEPUTIES_PARTIES = {
-    'Hadrien Buclin': 'Ensemble à Gauche',  # EàG-POP
-    'Rebecca Ruiz': 'PS',  # Conseillère d'État
-    'Vassilis Venizelos': 'Les Verts',  # Conseiller d'État
-    'Christelle Luisier': 'PLR',  # Conseillère d'État
-    'Isabelle Moret': 'PLR',  # Conseillère d'État
-    'Valérie Dittli': 'Le Centre',  # Conseillère d'État
-    'Frédéric Borloz': 'PLR',  # Conseiller d'État
-    'Pierre-Yves Maillard': 'PS',
-    'Ada Marra': 'PS',
-}
 
-# Fribourg deputies/government party mapping
-FRIBOURG_DEPUTIES_PARTIES = {
-    'Olivier Curty': 'Le Centre',  # Conseiller d'État
-    'Jean-François Steiert': 'PS',  # Conseiller d'État
-    'Didier Castella': 'Le Centre',  # Conseiller d'État
-    'Romain Collaud': 'PLR',  # Conseiller d'État
-    'Sylvie Bonvin-Sansonnens': 'Les Verts',  # Conseillère d'État
-    'Philippe Demierre': 'UDC',  # Conseiller d'État
-    'Sophie Tritten': 'Le Centre',  # Conseillère d'État
-}
+def parse_submitted_authors(html: str) -> List[Dict]:
+    """Authors listed as "Name (Party)" links in the entrySubmitted block
+    (Zurich city parliament). Only that block is parsed, not the whole page."""
+    from bs4 import BeautifulSoup, SoupStrainer
+    
+    if "entrySubmitted" not in html:
+        return []
+    block = BeautifulSoup(html, SCRAPE_PARSER,
+                          parse_only=SoupStrainer("div", class_="entrySubmitted"))
+    submitted_div = block.find("div", class_="entrySubmitted")
+    if not submitted_div:
+        return []
+    
+    authors = []
+    for link in submitted_div.find_all("a"):
+        text = link.get_text(strip=True)
+        match = AUTHOR_WITH_PARTY_PATTERN.match(text)
+        if match:
+            authors.append({
+                'fullname': match.group(1).strip(),
+                'party': match.group(2).strip(),
+            })
+        elif text and not text.startswith('http'):
+            authors.append({
+                'fullname': text,
+                'party': '',
+            })
+    return authors
 
-# Valais deputies party mapping (scraped from parlement.vs.ch)
-VALAIS_DEPUTIES_PARTIES = {
-    # Based on current Grand Council composition
-    'Blaise Melly': 'Le Centre',
-    'Andrea Amherd-Burgener': 'Le Centre',
-    'Emmanuel Revaz': 'Le Centre',
-    'Sonia Tauss-Cornut': 'PS',
-    'Anne-Laure Secco': 'PLR',
-    'Dina Studer': 'Les Verts',
-    'Rahel Pirovino-Indermitte': 'Le Centre',
-    'Aurel Schmid': 'UDC',
-    'Urs Juon': 'UDC',
-    'Damien Revaz': 'Le Centre',
-    'Florian Chappot': 'PLR',
-    'Diego Wellig': 'Le Centre',
-    'Franz Ruppen': 'UDC',
-    'Philipp Matthias Bregy': 'Le Centre',
-    'Beat Rieder': 'Le Centre',
-    'Mathias Reynard': 'PS',
-    'Roberto Schmidt': 'Le Centre',
-    'Christophe Darbellay': 'Le Centre',
-    'Frédéric Favre': 'PLR',
-    'Franz Ruppen': 'UDC',
-}
 
-# Party name translations (DE -> FR)
-PARTY_TRANSLATIONS = {
-    'FDP': 'PLR', 'SVP': 'UDC', 'SP': 'PS', 
-    'CVP': 'PDC', 'Grüne': 'Les Verts', 'GLP': 'PVL',
-    'EVP': 'PEV', 'BDP': 'PBD', 'Mitte': 'Le Centre',
-    'Die Mitte': 'Le Centre', 'GPS': 'Les Verts',
-}
+def html_to_text(html: str) -> str:
+    """Text content of a page without building a DOM (same text as
+    BeautifulSoup.get_text(): no comments, scripts or styles)."""
+    text = HTML_SKIPPED_PATTERN.sub("", html)
+    return unescape(HTML_TAG_PATTERN.sub("", text))
 
 
-def scrape_authors_from_page(page_url: str) -> List[Dict]:
-    """Scrape author information directly from parliament page when API doesn't provide party info."""
-    import re
-    from bs4 import BeautifulSoup
-    
+def parse_labelled_authors(html: str) -> List[Dict]:
+    """Authors after an "Auteur:" / "Eingereicht von:" / "Autor:" label (Valais)."""
+    if not any(label in html for label in AUTHOR_LABELS):
+        return []
+    text = html_to_text(html)
+    for pattern in AUTHOR_LABEL_PATTERNS:
+        authors = []
+        for match in pattern.findall(text):
+            if isinstance(match, tuple) and len(match) == 2:
+                authors.append({
+                    'fullname': match[0].strip(),
+                    'party': match[1].strip(),
+                })
+            elif isinstance(match, str):
+                authors.append({
+                    'fullname': match.strip(),
+                    'party': '',
+                })
+        if authors:
+            return authors
+    return []
+
+
+def parse_authors(html: str) -> List[Dict]:
+    """Authors found in a parliament page (at most 3)."""
+    authors = parse_submitted_authors(html) or parse_labelled_authors(html)
+    return authors[:3]
+
+
+def scrape_authors_from_page(page_url: str) -> Optional[List[Dict]]:
+    """Scrape author information directly from parliament page when API doesn't provide party info.
+    Results are cached per URL and page content hash, so unchanged pages are not parsed again.
+    Returns None if the page could not be fetched."""
     if not page_url:
         return []
     
     try:
-        response = requests.get(page_url, timeout=15)
+        with SCRAPE_HOSTS.slot(page_url):
+            response = http_get(page_url, timeout=15)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
         
-        authors = []
-        
-        # Pattern for Zurich city parliament: "Name (Party)"
-        # Look for entrySubmitted div or similar
-        submitted_div = soup.find('div', class_='entrySubmitted')
-        if submitted_div:
-            # Find all links with author names
-            links = submitted_div.find_all('a')
-            for link in links:
-                text = link.get_text(strip=True)
-                # Match "Name (Party)" pattern
-                match = re.match(r'^(.+?)\s*\(([^)]+)\)$', text)
-                if match:
-                    authors.append({
-                        'fullname': match.group(1).strip(),
-                        'party': match.group(2).strip(),
-                    })
-                elif text and not text.startswith('http'):
-                    authors.append({
-                        'fullname': text,
-                        'party': '',
-                    })
-        
-        # Pattern for Valais parliament: look for author info
-        if not authors:
-            # Try to find author pattern in page text
-            text = soup.get_text()
-            # Match patterns like "Auteur: Name (Party)" or "Eingereicht von: Name (Party)"
-            patterns = [
-                r'(?:Auteur|Eingereicht von|Autor)[:\s]+([^(]+)\s*\(([^)]+)\)',
-                r'(?:Auteur|Eingereicht von|Autor)[:\s]+([^\n(]+)',
-            ]
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if isinstance(match, tuple) and len(match) == 2:
-                        authors.append({
-                            'fullname': match[0].strip(),
-                            'party': match[1].strip(),
-                        })
-                    elif isinstance(match, str):
-                        authors.append({
-                            'fullname': match.strip(),
-                            'party': '',
-                        })
-                if authors:
-                    break
+        cache = RESPONSE_CACHE
+        digest = hashlib.sha256(response.content).hexdigest()
+        if cache is not None:
+            cached = cache.get_result(page_url, digest)
+            if cached is not None:
+                return json.loads(cached)
         
-        return authors[:3]  # Limit to first 3 authors
+        authors = parse_authors(response.text)
+        if cache is not None:
+            cache.put_result(page_url, digest, json.dumps(authors, ensure_ascii=False))
+        return authors
+    except ReplayMiss:
+        raise
     except Exception as e:
-        return []
+        METRICS.error("scrape", e)
+        return None
 
 
 def find_efk_documents(docs: List[Dict], snippet_sources: List[str]) -> Dict[str, List[Dict]]:
@@ -602,36 +1082,12 @@ def find_efk_documents(docs: List[Dict], snippet_sources: List[str]) -> Dict[str
 
 def detect_snippet_language(text: str) -> str:
     """Detect if snippet is in French or German based on keywords."""
-    fr_keywords = ["Contrôle", "fédéral", "finances", "rapport", "conformément", 
-                   "recommandations", "audit", "prochaines", "également"]
-    de_keywords = ["Finanzkontrolle", "eidgenössisch", "Prüfung", "Bericht", 
-                   "gemäss", "Empfehlungen", "Kontrolle", "ebenfalls"]
-    
-    text_lower = text.lower()
-    fr_count = sum(1 for kw in fr_keywords if kw.lower() in text_lower)
-    de_count = sum(1 for kw in de_keywords if kw.lower() in text_lower)
-    
-    if fr_count > de_count:
-        return "fr"
-    elif de_count > fr_count:
-        return "de"
-    return "unknown"
+    return CLASSIFIER.language(text)
 
 
 def snippet_mentions_efk(text: str) -> bool:
     """Check if snippet text actually mentions EFK/CDF."""
-    if not text:
-        return False
-    text_lower = text.lower()
-    
-    efk_keywords = [
-        "eidgenössische finanzkontrolle", "eidgenössischen finanzkontrolle",
-        "finanzkontrolle des bundes", "efk", "efk-bericht", "efk-prüfung",
-        "contrôle fédéral des finances", "cdf", "rapport du cdf",
-        "controllo federale delle finanze",
-    ]
-    
-    return any(kw in text_lower for kw in efk_keywords)
+    return CLASSIFIER.mentions_efk(text)
 
 
 def extract_snippet_info(affair: Dict) -> Dict:
@@ -648,13 +1104,14 @@ def extract_snippet_info(affair: Dict) -> Dict:
     for snippet in snippets:
         source_name = snippet.get("source_name", "")
         text = snippet.get("text", "").strip()
+        mentions_efk = snippet_mentions_efk(text)
         
         # Only add source if the snippet actually mentions EFK/CDF
-        if snippet.get("source_type") == "docs" and source_name and snippet_mentions_efk(text):
+        if snippet.get("source_type") == "docs" and source_name and mentions_efk:
             sources.append(source_name)
         
         # Only keep excerpts that actually mention EFK/CDF
-        if text and text not in seen_texts and snippet_mentions_efk(text):
+        if text and text not in seen_texts and mentions_efk:
             # Clean up the text
             text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
             if len(text) > 50:  # Only meaningful excerpts
@@ -679,210 +1136,205 @@ def extract_snippet_info(affair: Dict) -> Dict:
     }
 
 
-def enrich_with_documents_and_authors(affairs: List[Dict]) -> List[Dict]:
-    """Fetch and add relevant documents and authors to each affair."""
-    print("\nFetching documents and authors for each affair...")
+def enrich_affair(affair: Dict) -> str:
+    """Fetch and add relevant documents and authors to one affair.
+    Requests that failed are listed in affair["_enrichment_failed"] (not
+    saved), so the sync state leaves the affair out and the next
+    --incremental run enriches it again (see build_sync_state).
+    Returns a short status string for the progress log."""
+    affair_id = affair.get("id")
+    status = []
+    failed = []
     
-    for i, affair in enumerate(affairs):
-        affair_id = affair.get("id")
-        title = affair.get("title_de") or affair.get("title_fr") or ""
-        print(f"  [{i+1}/{len(affairs)}] {title[:50]}...", end=" ")
+    # Extract snippet info (sources and text excerpts)
+    snippet_info = extract_snippet_info(affair)
+    snippet_sources = snippet_info["sources"]
+    
+    # Store text excerpts in both languages
+    if snippet_info["excerpts_fr"]:
+        affair["efk_excerpts_fr"] = snippet_info["excerpts_fr"]
+    if snippet_info["excerpts_de"]:
+        affair["efk_excerpts_de"] = snippet_info["excerpts_de"]
+    
+    # Fetch all documents for this affair
+    docs = fetch_affair_docs(affair_id)
+    if docs is None:
+        failed.append("docs")
+        docs = []
+    
+    if docs:
+        # Find documents that mention EFK (using snippets + name matching)
+        efk_docs_by_lang = find_efk_documents(docs, snippet_sources)
         
-        # Extract snippet info (sources and text excerpts)
-        snippet_info = extract_snippet_info(affair)
-        snippet_sources = snippet_info["sources"]
+        # Otherwise look for the mention in the documents themselves
+        verified_by_content = False
+        if DOCUMENT_VERIFIER and not efk_docs_by_lang["fr"] and not efk_docs_by_lang["de"]:
+            verified = [d for d in docs[:MAX_VERIFIED_DOCUMENTS] if DOCUMENT_VERIFIER.verify(d)]
+            if verified:
+                efk_docs_by_lang = find_efk_documents(verified, [d.get("name", "") for d in verified])
+                for doc in efk_docs_by_lang["fr"] + efk_docs_by_lang["de"]:
+                    doc["content_verified"] = True
+                verified_by_content = True
         
-        # Store text excerpts in both languages
-        if snippet_info["excerpts_fr"]:
-            affair["efk_excerpts_fr"] = snippet_info["excerpts_fr"]
-        if snippet_info["excerpts_de"]:
-            affair["efk_excerpts_de"] = snippet_info["excerpts_de"]
+        # Store FR documents for French interface (primary)
+        if efk_docs_by_lang["fr"]:
+            affair["efk_documents"] = efk_docs_by_lang["fr"]
+            status.append(f"✓ {len(efk_docs_by_lang['fr'])} doc(s)" + (" (content)" if verified_by_content else ""))
         
-        # Fetch all documents for this affair
-        docs = fetch_affair_docs(affair_id)
+        # Also store DE documents for future bilingual support
+        if efk_docs_by_lang["de"]:
+            affair["efk_documents_de"] = efk_docs_by_lang["de"]
         
-        if docs:
-            # Find documents that mention EFK (using snippets + name matching)
-            efk_docs_by_lang = find_efk_documents(docs, snippet_sources)
-            
-            # Store FR documents for French interface (primary)
-            if efk_docs_by_lang["fr"]:
-                affair["efk_documents"] = efk_docs_by_lang["fr"]
-                print(f"✓ {len(efk_docs_by_lang['fr'])} doc(s)", end=" ")
-            
-            # Also store DE documents for future bilingual support
-            if efk_docs_by_lang["de"]:
-                affair["efk_documents_de"] = efk_docs_by_lang["de"]
-            
-            # If no specific EFK docs found, include all docs for reference
-            if not efk_docs_by_lang["fr"] and not efk_docs_by_lang["de"]:
-                affair["all_documents"] = [{
-                    "id": d.get("id"),
-                    "name": d.get("name", ""),
-                    "url": d.get("url"),
-                    "mime_type": d.get("mime_type"),
-                } for d in docs[:5]]
-                print(f"({len(docs)} docs)", end=" ")
-        else:
-            # No docs but we have snippet sources - store them for reference
-            if snippet_sources:
-                affair["snippet_sources"] = snippet_sources
-            print("no docs", end=" ")
-        
-        # Fetch contributors (authors)
-        contributors = fetch_affair_contributors(affair_id)
-        authors = []
-        has_party_from_api = False
+        # If no specific EFK docs found, include all docs for reference
+        if not efk_docs_by_lang["fr"] and not efk_docs_by_lang["de"]:
+            affair["all_documents"] = [{
+                "id": d.get("id"),
+                "name": d.get("name", ""),
+                "url": d.get("url"),
+                "mime_type": d.get("mime_type"),
+            } for d in docs[:5]]
+            status.append(f"({len(docs)} docs)")
+    else:
+        # No docs but we have snippet sources - store them for reference
+        if snippet_sources:
+            affair["snippet_sources"] = snippet_sources
+        status.append("no docs")
+    
+    # Fetch contributors (authors)
+    contributors = fetch_affair_contributors(affair_id)
+    if contributors is None:
+        failed.append("contributors")
+        contributors = []
+    authors = []
+    has_party_from_api = False
+    
+    if contributors:
+        for c in contributors:
+            party_dict = c.get("party", {}) or {}
+            author_info = {
+                "fullname": c.get("fullname", ""),
+                "firstname": c.get("firstname", ""),
+                "lastname": c.get("lastname", ""),
+                "party_fr": party_dict.get("fr", "") if isinstance(party_dict, dict) else "",
+                "party_de": party_dict.get("de", "") if isinstance(party_dict, dict) else "",
+                "role": c.get("role_harmonized", ""),
+            }
+            if author_info["fullname"]:
+                authors.append(author_info)
+                if author_info["party_fr"] or author_info["party_de"]:
+                    has_party_from_api = True
+    
+    # If no party info from API, try different sources
+    if not has_party_from_api:
+        body_key = affair.get("body_key", "")
         
-        if contributors:
-            for c in contributors:
-                party_dict = c.get("party", {}) or {}
-                author_info = {
-                    "fullname": c.get("fullname", ""),
-                    "firstname": c.get("firstname", ""),
-                    "lastname": c.get("lastname", ""),
-                    "party_fr": party_dict.get("fr", "") if isinstance(party_dict, dict) else "",
-                    "party_de": party_dict.get("de", "") if isinstance(party_dict, dict) else "",
-                    "role": c.get("role_harmonized", ""),
-                }
-                if author_info["fullname"]:
-                    authors.append(author_info)
-                    if author_info["party_fr"] or author_info["party_de"]:
-                        has_party_from_api = True
+        # Known deputies of the canton (static tables and bern_deputies.json)
+        for author in authors:
+            deputy = DEPUTIES.lookup(author.get("fullname", ""), body_key)
+            if deputy:
+                author["party_fr"] = deputy["party_fr"]
+                author["party_de"] = deputy["party_de"]
+                has_party_from_api = True
         
-        # If no party info from API, try different sources
-        if not has_party_from_api:
-            body_key = affair.get("body_key", "")
-            
-            # Use static dictionaries for known cantons
-            party_dict = None
-            if body_key == "VS":
-                party_dict = VALAIS_DEPUTIES_PARTIES
-            elif body_key == "FR":
-                party_dict = FRIBOURG_DEPUTIES_PARTIES
-            elif body_key == "VD":
-                party_dict = VAUD_DEPUTIES_PARTIES
-            elif body_key == "ZG":
-                party_dict = ZUG_DEPUTIES_PARTIES
-            elif body_key == "BE":
-                # Load Bern deputies from JSON file
-                import os
-                bern_file = os.path.join(os.path.dirname(__file__), "bern_deputies.json")
-                if os.path.exists(bern_file):
-                    with open(bern_file, "r", encoding="utf-8") as f:
-                        bern_data = json.load(f)
-                    for author in authors:
-                        fullname = author.get("fullname", "")
-                        if fullname in bern_data:
-                            author["party_fr"] = bern_data[fullname].get("fr", "")
-                            author["party_de"] = bern_data[fullname].get("de", "")
-                            has_party_from_api = True
-            
-            if party_dict:
+        # For other cantons, try scraping the parliament page
+        page_url = affair.get("url_external_de") or affair.get("url_external_fr") or affair.get("url_external")
+        scraped_authors = scrape_authors_from_page(page_url)
+        if scraped_authors is None:
+            failed.append("page")
+        if scraped_authors:
+            # If we have authors from API, update them with scraped party info
+            if authors:
+                scraped_index = DeputyRegistry()
+                for scraped in scraped_authors:
+                    scraped_index.add(scraped.get('fullname', ''), party_de=scraped.get('party', ''))
                 for author in authors:
-                    fullname = author.get("fullname", "")
-                    if fullname in party_dict:
-                        party = party_dict[fullname]
-                        author["party_fr"] = party
-                        # Translate to German if needed
-                        de_parties = {v: k for k, v in PARTY_TRANSLATIONS.items()}
-                        author["party_de"] = de_parties.get(party, party)
-                        has_party_from_api = True
+                    scraped = scraped_index.lookup(author.get('fullname', ''), lastname=author.get('lastname'))
+                    if scraped and scraped['party_de']:
+                        author['party_de'] = scraped['party_de']
+                        author['party_fr'] = translate_party(scraped['party_de'], 'fr')
             
-            # For other cantons, try scraping the parliament page
-            page_url = affair.get("url_external_de") or affair.get("url_external_fr") or affair.get("url_external")
-            scraped_authors = scrape_authors_from_page(page_url)
-            if scraped_authors:
-                party_translations = {
-                    'FDP': 'PLR', 'SVP': 'UDC', 'SP': 'PS', 
-                    'CVP': 'PDC', 'Grüne': 'Les Verts', 'GLP': 'PVL',
-                    'EVP': 'PEV', 'BDP': 'PBD', 'Mitte': 'Le Centre',
-                }
-                
-                # If we have authors from API, update them with scraped party info
-                if authors:
-                    for author in authors:
-                        for scraped in scraped_authors:
-                            if scraped.get('fullname') and author.get('fullname'):
-                                if (scraped['fullname'] in author['fullname'] or 
-                                    author['fullname'] in scraped['fullname'] or
-                                    author.get('lastname', '') in scraped['fullname']):
-                                    if scraped.get('party'):
-                                        author['party_de'] = scraped['party']
-                                        author['party_fr'] = party_translations.get(scraped['party'], scraped['party'])
-                                    break
+            # Add any scraped authors not already in the list
+            existing_names = {a.get('fullname', '').lower() for a in authors}
+            existing_lastnames = {a.get('lastname', '').lower() for a in authors if a.get('lastname')}
+            for scraped in scraped_authors:
+                scraped_name = scraped.get('fullname', '')
+                scraped_lastname = scraped_name.split()[-1].lower() if ' ' in scraped_name else scraped_name.lower()
                 
-                # Add any scraped authors not already in the list
-                existing_names = {a.get('fullname', '').lower() for a in authors}
-                existing_lastnames = {a.get('lastname', '').lower() for a in authors if a.get('lastname')}
-                for scraped in scraped_authors:
-                    scraped_name = scraped.get('fullname', '')
-                    scraped_lastname = scraped_name.split()[-1].lower() if ' ' in scraped_name else scraped_name.lower()
-                    
-                    if scraped_name and scraped_name.lower() not in existing_names and scraped_lastname not in existing_lastnames:
-                        new_author = {
-                            'fullname': scraped_name,
-                            'firstname': scraped_name.split()[0] if ' ' in scraped_name else '',
-                            'lastname': scraped_name.split()[-1] if ' ' in scraped_name else scraped_name,
-                            'party_de': scraped.get('party', ''),
-                            'party_fr': party_translations.get(scraped.get('party', ''), scraped.get('party', '')),
-                            'role': 'author',
-                        }
-                        authors.append(new_author)
-                        existing_lastnames.add(scraped_lastname)
+                if scraped_name and scraped_name.lower() not in existing_names and scraped_lastname not in existing_lastnames:
+                    new_author = {
+                        'fullname': scraped_name,
+                        'firstname': scraped_name.split()[0] if ' ' in scraped_name else '',
+                        'lastname': scraped_name.split()[-1] if ' ' in scraped_name else scraped_name,
+                        'party_de': scraped.get('party', ''),
+                        'party_fr': translate_party(scraped.get('party', ''), 'fr'),
+                        'role': 'author',
+                    }
+                    authors.append(new_author)
+                    existing_lastnames.add(scraped_lastname)
+    
+    if authors:
+        affair["authors"] = authors
         
-        if authors:
-            affair["authors"] = authors
-            
-            # Filter out departments - keep only real authors
-            real_authors = [a for a in authors if a.get('role') != 'leading_department' and 
-                           not a.get('fullname', '').endswith(')') or 
-                           a.get('party_fr') or a.get('party_de')]
-            
-            # If no real authors found, use all authors
-            if not real_authors:
-                real_authors = authors
-            
-            # Create display strings with ALL authors
-            def format_author(author, lang='fr'):
-                party = author.get(f'party_{lang}', '') or author.get('party_de', '')
-                if party:
-                    return f"{author['fullname']} ({party})"
-                return author['fullname']
-            
-            # Format all real authors (deduplicated by fullname, normalized)
-            seen_names = set()
-            unique_authors = []
-            for a in real_authors:
-                name = a.get('fullname', '')
-                # Normalize: replace non-breaking spaces and strip
-                normalized_name = name.replace('\xa0', ' ').strip().lower()
-                if name and normalized_name not in seen_names:
-                    seen_names.add(normalized_name)
-                    unique_authors.append(a)
-            
-            authors_display_fr = ', '.join(format_author(a, 'fr') for a in unique_authors)
-            authors_display_de = ', '.join(format_author(a, 'de') for a in unique_authors)
-            
-            affair["author_display_fr"] = authors_display_fr
-            affair["author_display_de"] = authors_display_de
-            affair["author_display"] = authors_display_fr
-            
-            print(f"👤 {affair['author_display'][:30]}")
-        else:
-            print("")
+        # Filter out departments - keep only real authors
+        real_authors = [a for a in authors if a.get('role') != 'leading_department' and 
+                       not a.get('fullname', '').endswith(')') or 
+                       a.get('party_fr') or a.get('party_de')]
+        
+        # If no real authors found, use all authors
+        if not real_authors:
+            real_authors = authors
+        
+        # Create display strings with ALL authors
+        def format_author(author, lang='fr'):
+            party = author.get(f'party_{lang}', '') or author.get('party_de', '')
+            if party:
+                return f"{author['fullname']} ({party})"
+            return author['fullname']
         
-        # Generate FR/IT URLs from DE URL if missing
-        url_de = affair.get("url_external_de") or affair.get("url_external")
-        if url_de:
-            if not affair.get("url_external_fr"):
-                affair["url_external_fr"] = url_de.replace("/de/", "/fr/")
-            if not affair.get("url_external_it"):
-                affair["url_external_it"] = url_de.replace("/de/", "/it/")
+        # Format all real authors (deduplicated by fullname, normalized)
+        seen_names = set()
+        unique_authors = []
+        for a in real_authors:
+            name = a.get('fullname', '')
+            # Normalize: replace non-breaking spaces and strip
+            normalized_name = name.replace('\xa0', ' ').strip().lower()
+            if name and normalized_name not in seen_names:
+                seen_names.add(normalized_name)
+                unique_authors.append(a)
         
-        # Small delay to avoid rate limiting
-        import time
-        time.sleep(0.3)
+        authors_display_fr = ', '.join(format_author(a, 'fr') for a in unique_authors)
+        authors_display_de = ', '.join(format_author(a, 'de') for a in unique_authors)
+        
+        affair["author_display_fr"] = authors_display_fr
+        affair["author_display_de"] = authors_display_de
+        affair["author_display"] = authors_display_fr
+        
+        status.append(f"👤 {affair['author_display'][:30]}")
+    
+    # Generate FR/IT URLs from DE URL if missing
+    url_de = affair.get("url_external_de") or affair.get("url_external")
+    if url_de:
+        if not affair.get("url_external_fr"):
+            affair["url_external_fr"] = url_de.replace("/de/", "/fr/")
+        if not affair.get("url_external_it"):
+            affair["url_external_it"] = url_de.replace("/de/", "/it/")
+    
+    if failed:
+        affair["_enrichment_failed"] = failed
+        status.append(f"⚠ failed: {', '.join(failed)}")
+    return " ".join(status)
+
+
+def enrich_with_documents_and_authors(affairs: List[Dict]) -> List[Dict]:
+    """Fetch and add relevant documents and authors to each affair.
+    Affairs are processed concurrently (see configure_http); each one is
+    updated in place, so the result does not depend on the worker count."""
+    print("\nFetching documents and authors for each affair...")
+    
+    statuses = map_bounded(enrich_affair, affairs, MAX_WORKERS)
+    for i, (affair, status) in enumerate(zip(affairs, statuses)):
+        title = affair.get("title_de") or affair.get("title_fr") or ""
+        print(f"  [{i+1}/{len(affairs)}] {title[:50]}... {status}")
     
     return affairs
 
@@ -897,7 +1349,7 @@ def fetch_body_info() -> Dict[str, str]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=60)
+        response = http_get(url, params=params, timeout=60)
         response.raise_for_status()
         data = response.json()
         bodies = {b["body_key"]: b["name"] for b in data.get("data", [])}
@@ -912,7 +1364,10 @@ def fetch_body_info() -> Dict[str, str]:
         bodies.update(overrides)
         
         return bodies
+    except ReplayMiss:
+        raise
     except Exception as e:
+        METRICS.error("bodies", e)
         print(f"Error fetching bodies: {e}")
         return {}
 
@@ -939,7 +1394,7 @@ def enrich_with_body_names(affairs: List[Dict], bodies: Dict[str, str]) -> List[
 
 
 def save_results(affairs: List[Dict], filename: str = "cantonal_efk_mentions.json"):
-    """Save results to JSON file."""
+    """Save results to JSON file (projected on AFFAIR_FIELDS, skipped if unchanged)."""
     output = {
         "metadata": {
             "generated_at": datetime.now().isoformat(),
@@ -947,21 +1402,129 @@ def save_results(affairs: List[Dict], filename: str = "cantonal_efk_mentions.jso
             "source": "OpenParlData.ch API",
             "description": "Cantonal parliament mentions of the Swiss Federal Audit Office (EFK/CDF)",
         },
-        "data": affairs
+        "data": [project(affair, AFFAIR_FIELDS) for affair in affairs]
     }
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    
-    print(f"\n✓ Saved {len(affairs)} records to {filename}")
+    if write_json(filename, output, volatile=[GENERATED_AT]):
+        print(f"\n✓ Saved {len(affairs)} records to {filename}")
+    else:
+        print(f"\n✓ {filename} unchanged ({len(affairs)} records)")
+    print(f"✓ Delta: {describe_delta(write_delta(DELTA_DIR, output['data'], 'id'))}")
+
+
+def load_existing_results(filename: str = EXISTING_RESULTS_FILE) -> List[Dict]:
+    """Load affairs from a previous run (empty list if there is none)."""
+    if not os.path.exists(filename):
+        return []
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f).get("data", [])
+
+
+def merge_with_existing(affairs: List[Dict], existing_affairs: List[Dict]) -> List[Dict]:
+    """Merge: new affairs + existing affairs not in new set, most recent first."""
+    new_ids = {a.get("id") for a in affairs}
+    merged = affairs + [old for old in existing_affairs if old.get("id") not in new_ids]
+    merged.sort(key=lambda x: x.get("begin_date", "") or "", reverse=True)
+    return merged
+
+
+def load_sync_state(existing_affairs: List[Dict], filename: str = SYNC_STATE_FILE) -> Dict:
+    """Load the incremental sync state.
+    Without a state file it is rebuilt from the previous output, so the
+    first --incremental run does not have to start from scratch."""
+    if os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return build_sync_state(existing_affairs)
+
+
+def build_sync_state(affairs: List[Dict]) -> Dict:
+    """State for a set of affairs: updated_at per id and the high-water mark.
+    Affairs whose enrichment failed (see enrich_affair) are left out and the
+    watermark stays at or below their updated_at, so the next run finds them
+    again and does not reuse their incomplete record."""
+    dated = [a for a in affairs if a.get("id") and a.get("updated_at")]
+    updated_at = {str(a["id"]): a["updated_at"] for a in dated if not a.get("_enrichment_failed")}
+    watermark = max(updated_at.values()) if updated_at else None
+    failed = [a["updated_at"] for a in dated if a.get("_enrichment_failed")]
+    if failed:
+        watermark = min([min(failed)] + ([watermark] if watermark else []))
+    return {
+        "last_run": datetime.now().isoformat(),
+        "watermark": watermark,
+        "updated_at": updated_at,
+    }
+
+
+def save_sync_state(affairs: List[Dict], filename: str = SYNC_STATE_FILE) -> None:
+    """Save the sync state for the affairs written by this run."""
+    state = build_sync_state(affairs)
+    write_json(filename, state, volatile=[("last_run",)], compress=False)
+    failed = sum(1 for a in affairs if a.get("_enrichment_failed"))
+    print(f"✓ Sync state saved (watermark {state['watermark']}"
+          + (f", {failed} affair(s) to enrich again)" if failed else ")"))
+
+
+def split_unchanged(affairs: List[Dict], state: Dict,
+                    existing_affairs: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Split search results into affairs to enrich and unchanged affairs.
+    An affair is unchanged when its updated_at matches the sync state and the
+    previous output has it; the previous (already enriched) record is reused."""
+    known = state.get("updated_at", {})
+    existing_by_id = {a.get("id"): a for a in existing_affairs}
+    changed, reused = [], []
+    for affair in affairs:
+        affair_id = affair.get("id")
+        previous = existing_by_id.get(affair_id)
+        if (previous is not None and affair.get("updated_at")
+                and known.get(str(affair_id)) == affair["updated_at"]):
+            reused.append(previous)
+        else:
+            changed.append(affair)
+    return changed, reused
 
 
 def main():
     parser = argparse.ArgumentParser(description="Fetch cantonal EFK mentions")
-    parser.add_argument("--months-back", type=int, default=None,
-                       help="Only fetch affairs from the last N months (default: all)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--months-back", type=int, default=None,
+                     help="Only fetch affairs from the last N months (default: all)")
+    mode.add_argument("--incremental", action="store_true",
+                     help="Only fetch affairs updated since the last run (see sync_state.json)")
+    parser.add_argument("--all-search-terms", action="store_true",
+                       help="Search every term over all affairs and re-measure their overlap (see search_plan.json)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                       help=f"Affairs enriched in parallel (default: {DEFAULT_MAX_WORKERS}, 1 = sequential)")
+    parser.add_argument("--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                       help=f"Request rate limit per host (default: {DEFAULT_REQUESTS_PER_SECOND})")
+    parser.add_argument("--max-per-host", type=int, default=DEFAULT_MAX_PER_HOST,
+                       help=f"Parliament pages scraped at once per host (default: {DEFAULT_MAX_PER_HOST})")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                       help=f"Retries of a request after a network error, 429 or 5xx (default: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_FILE,
+                       help="SQLite file for the HTTP response cache (default: .http_cache.sqlite)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Disable the HTTP response cache")
+    parser.add_argument("--verify-documents", action="store_true",
+                       help="Download documents whose names do not mention the EFK/CDF and check their text")
+    parser.add_argument("--document-fixtures", metavar="DIR",
+                       help="Read documents from DIR (by file name) instead of downloading them")
+    parser.add_argument("--transport", choices=TRANSPORT_MODES, default="live",
+                       help="live (default), record (also archive responses) or replay (archive only, offline)")
+    parser.add_argument("--archive-file", default=DEFAULT_ARCHIVE_FILE,
+                       help="SQLite archive for --transport record/replay (default: .http_archive.sqlite)")
+    parser.add_argument("--metrics-file", default=DEFAULT_METRICS_FILE,
+                       help="JSON report of stage timings and request metrics (default: run_metrics.json)")
+    parser.add_argument("--prometheus-file", metavar="FILE",
+                       help="Also write the metrics as a Prometheus textfile")
     args = parser.parse_args()
     
+    configure_transport(args.transport, args.archive_file)
+    configure_http(args.max_workers, args.requests_per_second, args.max_per_host, args.max_retries)
+    configure_cache(None if args.no_cache else args.cache_file)
+    configure_document_verification(args.verify_documents or bool(args.document_fixtures),
+                                    args.document_fixtures)
+    
     print("=" * 60)
     print("Fetching cantonal mentions of the Federal Audit Office")
     print("=" * 60)
@@ -969,55 +1532,68 @@ def main():
     if args.months_back:
         print(f"  (Limited to last {args.months_back} month(s))")
     
+    existing_affairs = []
+    sync_state = None
+    if args.incremental:
+        existing_affairs = load_existing_results()
+        sync_state = load_sync_state(existing_affairs)
+        print(f"  (Incremental: affairs updated since {sync_state['watermark'] or 'the beginning'})")
+    
     # Fetch body information
     print("\nFetching parliament information...")
-    bodies = fetch_body_info()
+    with METRICS.stage("fetch_body_info"):
+        bodies = fetch_body_info()
     print(f"  Found {len(bodies)} parliaments")
     
     # Fetch all mentions
     print("\nSearching for federal audit office mentions...")
-    affairs = fetch_all_federal_mentions()
+    cutoff_date = None
+    if args.months_back:
+        cutoff_date = (datetime.now() - timedelta(days=args.months_back * 30)).strftime("%Y-%m-%d")
+    with METRICS.stage("fetch_all_federal_mentions"):
+        if args.incremental:
+            affairs = fetch_all_federal_mentions(since=sync_state["watermark"], sort_by="-updated_at",
+                                                 all_terms=args.all_search_terms)
+        else:
+            affairs = fetch_all_federal_mentions(since=cutoff_date, all_terms=args.all_search_terms)
     
     # Filter by date if --months-back specified
     if args.months_back:
-        cutoff_date = (datetime.now() - timedelta(days=args.months_back * 30)).strftime("%Y-%m-%d")
         original_count = len(affairs)
         affairs = [a for a in affairs if (a.get("begin_date") or "") >= cutoff_date]
         print(f"  Filtered to {len(affairs)} affairs (from {original_count}) since {cutoff_date}")
     
-    # Enrich with body names
-    affairs = enrich_with_body_names(affairs, bodies)
+    # Incremental: reuse the previous enrichment of unchanged affairs
+    reused = []
+    if args.incremental:
+        affairs, reused = split_unchanged(affairs, sync_state, existing_affairs)
+        print(f"  {len(affairs)} new or updated affair(s), {len(reused)} unchanged")
     
-    # Fetch French snippets for bilingual cantons (VS, FR)
-    fetch_french_snippets_for_bilingual(affairs)
+    # Enrich with body names
+    with METRICS.stage("enrich_with_body_names"):
+        affairs = enrich_with_body_names(affairs, bodies)
     
     # Fetch documents and authors for each affair
-    affairs = enrich_with_documents_and_authors(affairs)
+    with METRICS.stage("enrich_with_documents_and_authors"):
+        affairs = enrich_with_documents_and_authors(affairs)
+    affairs.extend(reused)
     
     # Sort by date (most recent first)
     affairs.sort(key=lambda x: x.get("begin_date", "") or "", reverse=True)
     
-    # If --months-back, merge with existing data (keep old entries)
-    if args.months_back:
-        import os
-        existing_file = os.path.join(os.path.dirname(__file__), "cantonal_efk_mentions.json")
-        if os.path.exists(existing_file):
-            with open(existing_file, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
-            existing_affairs = existing_data.get("data", [])
-            
-            # Merge: new affairs + existing affairs not in new set
-            new_ids = {a.get("id") for a in affairs}
-            for old in existing_affairs:
-                if old.get("id") not in new_ids:
-                    affairs.append(old)
-            
-            # Re-sort
-            affairs.sort(key=lambda x: x.get("begin_date", "") or "", reverse=True)
+    # If --months-back or --incremental, merge with existing data (keep old entries)
+    if args.months_back or args.incremental:
+        if not existing_affairs:
+            existing_affairs = load_existing_results()
+        if existing_affairs:
+            affairs = merge_with_existing(affairs, existing_affairs)
             print(f"  Merged with existing data: {len(affairs)} total affairs")
     
     # Save results
-    save_results(affairs)
+    with METRICS.stage("save_results"):
+        save_results(affairs)
+        if args.incremental:
+            save_sync_state(affairs)
     
     # Summary by canton
     print("\n" + "=" * 60)
@@ -1036,6 +1612,19 @@ def main():
         print(f"  {body}: {count}")
     
     print(f"\n✓ {with_efk_docs}/{len(affairs)} objets avec documents EFK identifiés")
+    
+    if RESPONSE_CACHE is not None:
+        print(RESPONSE_CACHE.summary())
+        RESPONSE_CACHE.close()
+    if TRANSPORT.mode != "live":
+        print(TRANSPORT.summary())
+    TRANSPORT.close()
+    
+    print("\n" + METRICS.summary())
+    METRICS.write_report(args.metrics_file)
+    print(f"✓ Metrics written to {args.metrics_file}")
+    if args.prometheus_file:
+        METRICS.write_prometheus(args.prometheus_file)
 
 
 if __name__ == "__main__":
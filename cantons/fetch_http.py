@@ -0,0 +1,463 @@
+"""
+HTTP helpers shared by the fetch scripts.
+Per-host token-bucket rate limiting, a bounded worker pool, a persistent
+response cache and a request scheduler (retries with backoff, Retry-After,
+per-host circuit breaker and adaptive concurrency).
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+from urllib.parse import urlencode, urlsplit
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Defaults used by the fetch scripts (overridable from the command line)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_MAX_PER_HOST = 2
+DEFAULT_MAX_RETRIES = 3
+
+# Responses worth retrying (rate limited, server errors, gateway timeouts)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until one token is available, then consume it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use."""
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND):
+        self.requests_per_second = requests_per_second
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second)
+                self._buckets[host] = bucket
+        bucket.acquire()
+
+
+class HostConcurrencyLimiter:
+    """At most `max_per_host` requests in flight per host."""
+
+    def __init__(self, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        self.max_per_host = max(1, max_per_host)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+
+def map_bounded(func: Callable[[T], R], items: Iterable[T],
+                max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[R]:
+    """Apply `func` to `items` with at most `max_workers` calls in flight.
+
+    Results are yielded in input order, so callers see the same sequence
+    as a plain loop. With `max_workers <= 1` no threads are started.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(func, items)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpen(OSError):
+    """Requests to the host are suspended after repeated failures."""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit of a host
+    opens: requests fail fast with CircuitOpen for `cooldown` seconds. Then
+    one request is let through; its success closes the circuit, its failure
+    opens it again."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: set = set()
+        self._lock = threading.Lock()
+
+    def before(self, host: str) -> None:
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if time.monotonic() - opened_at < self.cooldown or host in self._probing:
+                raise CircuitOpen(f"circuit open for {host}")
+            self._probing.add(host)
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return host in self._opened_at
+
+    def success(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = 0
+            self._opened_at.pop(host, None)
+            self._probing.discard(host)
+
+    def failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host in self._probing or self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+            self._probing.discard(host)
+
+
+class AdaptiveConcurrency:
+    """Per-host limit on requests in flight, tuned AIMD-style.
+
+    The limit grows by about one per round of successful requests
+    (additive increase) and is halved on errors and throttling responses
+    (multiplicative decrease, at most once per `decrease_interval` so a
+    burst of failures counts once). Latency only holds the limit: it does
+    not grow while responses are slower than `latency_tolerance` times the
+    host's usual latency (a moving average of its successful requests), so
+    slow but successful requests such as large searches never shrink it."""
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = DEFAULT_MAX_WORKERS,
+                 latency_tolerance: float = 2.0, decrease_interval: float = 1.0):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.latency_tolerance = latency_tolerance
+        self.decrease_interval = decrease_interval
+        self._limits: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._decreased_at: Dict[str, float] = {}
+        self._latencies: Dict[str, float] = {}
+        self._condition = threading.Condition()
+
+    def limit(self, host: str) -> float:
+        with self._condition:
+            return self._limits.get(host, self.initial)
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        with self._condition:
+            while self._in_flight.get(host, 0) >= int(self._limits.get(host, self.initial)):
+                self._condition.wait()
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight[host] -= 1
+                self._condition.notify_all()
+
+    def success(self, host: str, latency: float) -> None:
+        with self._condition:
+            usual = self._latencies.get(host, latency)
+            self._latencies[host] = 0.8 * usual + 0.2 * latency
+            if latency > self.latency_tolerance * usual:
+                return
+            limit = self._limits.get(host, self.initial)
+            self._limits[host] = min(self.maximum, limit + 1 / limit)
+            self._condition.notify_all()
+
+    def congestion(self, host: str) -> None:
+        with self._condition:
+            now = time.monotonic()
+            if now - self._decreased_at.get(host, float("-inf")) < self.decrease_interval:
+                return
+            self._decreased_at[host] = now
+            self._limits[host] = max(self.minimum, self._limits.get(host, self.initial) / 2)
+
+
+class RequestScheduler:
+    """Sends requests with retries, backoff, Retry-After, circuit breaking
+    and adaptive per-host concurrency.
+
+    `request(url, send)` calls `send()` (one HTTP attempt) until it returns
+    a response whose status is not in RETRY_STATUSES, raises an error that
+    is not worth retrying, or `max_retries` retries are spent. The last
+    response is returned (or the last error raised) for the caller to
+    handle as before; the same happens as soon as the failures open the
+    circuit of the host. Errors with a `code` attribute (urllib's HTTPError)
+    are treated like responses with that status. Waits between attempts use
+    exponential backoff with full jitter, or the server's Retry-After, which
+    also pauses the other requests to that host."""
+
+    def __init__(self, rate_limiter: HostRateLimiter = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = 0.5, max_delay: float = 30.0, max_retry_after: float = 120.0,
+                 breaker: CircuitBreaker = None, concurrency: AdaptiveConcurrency = None,
+                 no_retry: Tuple[type, ...] = (),
+                 on_retry: Callable[[str], None] = None):
+        self.rate_limiter = rate_limiter
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.breaker = breaker or CircuitBreaker()
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.no_retry = (CircuitOpen,) + tuple(no_retry)
+        self.on_retry = on_retry
+        self._paused_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, base_delay * 2**attempt], capped at max_delay."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _wait_for_host(self, host: str) -> None:
+        while True:
+            with self._lock:
+                wait = self._paused_until.get(host, 0) - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _pause_host(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self._paused_until[host] = max(self._paused_until.get(host, 0), time.monotonic() + seconds)
+
+    def request(self, url: str, send: Callable[[], R], on_retry: Callable[[str], None] = None) -> R:
+        """`on_retry` replaces the scheduler's own callback for this request."""
+        on_retry = on_retry or self.on_retry
+        host = urlsplit(url).netloc.lower()
+        attempt = 0
+        while True:
+            self.breaker.before(host)
+            self._wait_for_host(host)
+            response, error, status, headers = None, None, None, {}
+            with self.concurrency.slot(host):
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(url)
+                start = time.monotonic()
+                try:
+                    response = send()
+                    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+                    headers = getattr(response, "headers", None) or {}
+                except self.no_retry:
+                    raise
+                except Exception as e:
+                    error = e
+                    status = getattr(e, "code", None)
+                    headers = getattr(e, "headers", None) or {}
+                latency = time.monotonic() - start
+
+            retryable = status in RETRY_STATUSES if status is not None else isinstance(error, OSError)
+            if not retryable:
+                self.breaker.success(host)
+                self.concurrency.success(host, latency)
+                if error is not None:
+                    raise error
+                return response
+
+            self.breaker.failure(host)
+            self.concurrency.congestion(host)
+            if attempt >= self.max_retries or self.breaker.is_open(host):
+                if error is not None:
+                    raise error
+                return response
+
+            retry_after = retry_after_seconds(headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = min(retry_after, self.max_retry_after)
+                self._pause_host(host, delay)
+            else:
+                delay = self.backoff(attempt)
+            attempt += 1
+            if on_retry is not None:
+                on_retry(url)
+            # Release the connection of a discarded (possibly streamed) response
+            if hasattr(response, "close"):
+                response.close()
+            time.sleep(delay)
+
+
+class ResponseCache:
+    """SQLite-backed HTTP response cache with LRU eviction.
+
+    Entries are keyed by URL and query parameters. Each entry keeps the
+    body, the `ETag` / `Last-Modified` validators and the time it was last
+    confirmed fresh; callers decide on lifetimes and revalidation.
+
+    The `results` table keeps values derived from a response (e.g. scraped
+    authors), one per URL, valid only for the body hash they were computed
+    from.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, body BLOB, etag TEXT, last_modified TEXT,"
+            " content_type TEXT, stored_at REAL, accessed_at REAL, size INTEGER)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " url TEXT PRIMARY KEY, digest TEXT, value TEXT, stored_at REAL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Dict = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, content_type, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        body, etag, last_modified, content_type, stored_at = row
+        return {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": content_type,
+            "stored_at": stored_at,
+        }
+
+    def put(self, key: str, body: bytes, etag: str = None, last_modified: str = None,
+            content_type: str = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, content_type, now, now, len(body)),
+            )
+            self._evict()
+            self._db.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as fresh again (after a 304 Not Modified)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self._db.commit()
+
+    def get_result(self, url: str, digest: str) -> Optional[str]:
+        """Derived value stored for `url`, if it was computed from the body with `digest`."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM results WHERE url = ? AND digest = ?", (url, digest)
+            ).fetchone()
+        return row[0] if row else None
+
+    def last_result(self, url: str) -> Optional[Tuple[str, str]]:
+        """(digest, value) stored for `url`, whatever body it was computed from."""
+        with self._lock:
+            row = self._db.execute("SELECT digest, value FROM results WHERE url = ?", (url,)).fetchone()
+        return tuple(row) if row else None
+
+    def put_result(self, url: str, digest: str, value: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (url, digest, value, time.time())
+            )
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def record_hit(self, size: int, revalidated: bool = False) -> None:
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+            if revalidated:
+                self.revalidated += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def summary(self) -> str:
+        return (f"HTTP cache: {self.hits} hit(s) ({self.revalidated} revalidated), "
+                f"{self.misses} miss(es), {self.bytes_saved / 1024:.0f} KB not re-downloaded")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,185 @@
+"""
+Run metrics of the fetch scripts: wall time per pipeline stage and, per
+endpoint, request latency histograms, status codes, bytes, retries, cache
+hits and the errors that the pipeline swallows (and turns into empty results).
+Cache hits are counted apart: they are not requests and have no latency.
+Written as a JSON report and optionally as a Prometheus textfile (for the
+node_exporter textfile collector).
+"""
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+from output import atomic_write
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last one is +Inf
+        self.statuses: Counter = Counter()
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.errors: Counter = Counter()
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": len(self.latencies),
+            "statuses": dict(sorted(self.statuses.items())),
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "swallowed_errors": dict(sorted(self.errors.items())),
+            "latency_seconds": {
+                "total": round(sum(self.latencies), 3),
+                "mean": round(sum(self.latencies) / len(self.latencies), 4) if self.latencies else 0.0,
+                "p50": round(_percentile(self.latencies, 0.5), 4),
+                "p95": round(_percentile(self.latencies, 0.95), 4),
+                "max": round(max(self.latencies, default=0.0), 4),
+            },
+            "histogram": {("+Inf" if i == len(LATENCY_BUCKETS) else str(LATENCY_BUCKETS[i])): count
+                          for i, count in enumerate(self.buckets)},
+        }
+
+
+class Metrics:
+    """Thread-safe collector shared by the request helpers of a script."""
+
+    def __init__(self, job: str):
+        self.job = job
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.stages: Dict[str, float] = {}
+        self.endpoints: Dict[str, EndpointMetrics] = defaultdict(EndpointMetrics)
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the wall time of a pipeline stage (added up if it runs several times)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def observe(self, endpoint: str, seconds: float, status, size: int = 0) -> None:
+        """One request: latency, status code (or "error") and body size."""
+        with self._lock:
+            entry = self.endpoints[endpoint]
+            entry.latencies.append(seconds)
+            entry.buckets[next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+                               len(LATENCY_BUCKETS))] += 1
+            entry.statuses[str(status)] += 1
+            entry.bytes += size
+
+    def retry(self, endpoint: str) -> None:
+        with self._lock:
+            self.endpoints[endpoint].retries += 1
+
+    def cache_hit(self, endpoint: str) -> None:
+        """A response served from the cache, without a request."""
+        with self._lock:
+            self.endpoints[endpoint].cache_hits += 1
+
+    def error(self, endpoint: str, exc: BaseException) -> None:
+        """An exception caught and turned into an empty or default result."""
+        with self._lock:
+            self.endpoints[endpoint].errors[type(exc).__name__] += 1
+
+    def report(self) -> Dict:
+        with self._lock:
+            endpoints = {name: entry.to_dict() for name, entry in sorted(self.endpoints.items())}
+            stages = {name: round(seconds, 3) for name, seconds in self.stages.items()}
+        return {
+            "job": self.job,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self._start, 3),
+            "stages": stages,
+            "endpoints": endpoints,
+            "totals": {
+                "requests": sum(e["requests"] for e in endpoints.values()),
+                "bytes": sum(e["bytes"] for e in endpoints.values()),
+                "retries": sum(e["retries"] for e in endpoints.values()),
+                "cache_hits": sum(e["cache_hits"] for e in endpoints.values()),
+                "swallowed_errors": sum(sum(e["swallowed_errors"].values()) for e in endpoints.values()),
+            },
+        }
+
+    def write_report(self, path: str) -> None:
+        atomic_write(path, json.dumps(self.report(), ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        report = self.report()
+        job = f'job="{self.job}"'
+        lines = [
+            "# HELP fetch_stage_duration_seconds Wall time of a pipeline stage.",
+            "# TYPE fetch_stage_duration_seconds gauge",
+        ]
+        lines += [f'fetch_stage_duration_seconds{{{job},stage="{name}"}} {seconds}'
+                  for name, seconds in report["stages"].items()]
+        lines += [
+            "# HELP fetch_request_duration_seconds Request latency per endpoint.",
+            "# TYPE fetch_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, entry in sorted(self.endpoints.items()):
+                labels = f'{job},endpoint="{name}"'
+                cumulative = 0
+                for i, count in enumerate(entry.buckets):
+                    cumulative += count
+                    bound = "+Inf" if i == len(LATENCY_BUCKETS) else LATENCY_BUCKETS[i]
+                    lines.append(f'fetch_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"fetch_request_duration_seconds_sum{{{labels}}} {sum(entry.latencies):.6f}")
+                lines.append(f"fetch_request_duration_seconds_count{{{labels}}} {len(entry.latencies)}")
+        for metric, help_text, key in (
+            ("fetch_response_bytes_total", "Response bytes per endpoint.", "bytes"),
+            ("fetch_retries_total", "Retried requests per endpoint.", "retries"),
+            ("fetch_cache_hits_total", "Responses served from the cache per endpoint.", "cache_hits"),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{{job},endpoint="{name}"}} {entry[key]}'
+                      for name, entry in report["endpoints"].items()]
+        lines += ["# HELP fetch_requests_total Requests per endpoint and status.",
+                  "# TYPE fetch_requests_total counter"]
+        lines += [f'fetch_requests_total{{{job},endpoint="{name}",status="{status}"}} {count}'
+                  for name, entry in report["endpoints"].items() for status, count in entry["statuses"].items()]
+        lines += ["# HELP fetch_swallowed_errors_total Errors turned into empty results.",
+                  "# TYPE fetch_swallowed_errors_total counter"]
+        lines += [f'fetch_swallowed_errors_total{{{job},endpoint="{name}",error="{error}"}} {count}'
+                  for name, entry in report["endpoints"].items()
+                  for error, count in entry["swallowed_errors"].items()]
+        lines += ["# HELP fetch_run_duration_seconds Wall time of the run.",
+                  "# TYPE fetch_run_duration_seconds gauge",
+                  f"fetch_run_duration_seconds{{{job}}} {report['wall_seconds']}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        atomic_write(path, self.prometheus().encode("utf-8"))
+
+    def summary(self) -> str:
+        """Short table for the end of the run log."""
+        report = self.report()
+        lines = [f"{'endpoint':<14} {'req':>5} {'cached':>6} {'p50 ms':>7} {'p95 ms':>7} {'KB':>7} {'retry':>5} {'err':>4}"]
+        for name, entry in report["endpoints"].items():
+            latency = entry["latency_seconds"]
+            lines.append(f"{name:<14} {entry['requests']:>5} {entry['cache_hits']:>6} {latency['p50'] * 1000:>7.0f} "
+                         f"{latency['p95'] * 1000:>7.0f} {entry['bytes'] / 1024:>7.0f} "
+                         f"{entry['retries']:>5} {sum(entry['swallowed_errors'].values()):>4}")
+        lines.append("stages: " + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in report["stages"].items()))
+        return "\n".join(lines)
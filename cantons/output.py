@@ -0,0 +1,209 @@
+"""
+Writers for the JSON files published with the site.
+Records are projected on an explicit list of fields, serialized compactly
+and deterministically, and written atomically, only when their content
+changed. A .gz copy (and a .br copy when brotli is installed) is written
+next to each file for hosts that serve precompressed assets.
+write_delta() records which records were added, changed or removed since
+the previous run, from per-record content hashes.
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Fields kept in cantonal_efk_mentions.json records. API fields
+# the site never reads (_search_meta, links, url_api, ...) are not listed.
+LANGUAGE_SUFFIXES = ("de", "fr", "it", "rm")
+AFFAIR_FIELDS = (
+    ["id", "body_key", "body_id", "body_name", "body_name_fr", "body_name_original",
+     "external_id", "number", "begin_date", "end_date", "created_at", "updated_at"]
+    + [f"title_{lang}" for lang in LANGUAGE_SUFFIXES]
+    + [f"title_long_{lang}" for lang in LANGUAGE_SUFFIXES]
+    + [f"type_name_{lang}" for lang in LANGUAGE_SUFFIXES]
+    + [f"type_harmonized_{lang}" for lang in LANGUAGE_SUFFIXES + ("en", "id", "wikidata_id")]
+    + ["type_external_id"]
+    + [f"state_name_{lang}" for lang in LANGUAGE_SUFFIXES]
+    + ["state_external_id", "url_external"]
+    + [f"url_external_{lang}" for lang in LANGUAGE_SUFFIXES]
+    + ["efk_excerpts_fr", "efk_excerpts_de", "efk_documents", "efk_documents_de",
+       "all_documents", "snippet_sources", "authors",
+       "author_display", "author_display_fr", "author_display_de"]
+)
+
+# Fields of missing_objects_tags.json items ("error" marks entries to retry)
+MISSING_TAGS_FIELDS = ["business_number", "tags", "tags_de", "tags_it", "found", "error"]
+
+# Metadata that changes on every run and does not count as a change
+GENERATED_AT = ("metadata", "generated_at")
+
+# Process umask, read once (os.umask can only be read by setting it)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Number of delta files kept per dataset
+DELTA_HISTORY = 30
+RECORD_HASH_CHARS = 16
+
+
+def project(record: Dict, fields: Sequence[str]) -> Dict:
+    """Copy of `record` with only `fields` (missing fields are left out)."""
+    return {field: record[field] for field in fields if field in record}
+
+
+def dumps(payload: Any) -> bytes:
+    """Compact, deterministic JSON (sorted keys, no whitespace)."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def content_digest(payload: Any, volatile: Iterable[Tuple[str, ...]] = ()) -> str:
+    """SHA-256 of the serialized payload, ignoring the `volatile` key paths."""
+    volatile = list(volatile)
+    if volatile:
+        payload = copy.deepcopy(payload)
+        for path in volatile:
+            parent = payload
+            for key in path[:-1]:
+                parent = parent.get(key, {}) if isinstance(parent, dict) else {}
+            if isinstance(parent, dict):
+                parent.pop(path[-1], None)
+    return hashlib.sha256(dumps(payload)).hexdigest()
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Write `data` to a temporary file next to `path`, then rename it over `path`.
+    The file keeps the mode of the file it replaces, or gets the one open()
+    would give it (mkstemp creates its files readable by the owner only)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def compressed_variants(data: bytes) -> List[Tuple[str, bytes]]:
+    """(suffix, bytes) of the precompressed copies of `data`."""
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    return variants
+
+
+def write_json(path: str, payload: Any, volatile: Iterable[Tuple[str, ...]] = (),
+               compress: bool = True) -> bool:
+    """Write `payload` to `path` and, with `compress`, its compressed copies.
+    Nothing is written when the existing file has the same content (ignoring
+    the `volatile` key paths). Returns True if the file was written."""
+    volatile = list(volatile)
+    digest = content_digest(payload, volatile)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            existing = f.read()
+        try:
+            unchanged = content_digest(json.loads(existing), volatile) == digest
+        except ValueError:
+            unchanged = False
+        if unchanged:
+            if not compress:
+                return False
+            suffixes = [".gz"] + ([".br"] if brotli is not None else [])
+            if not all(os.path.exists(path + suffix) for suffix in suffixes):
+                for suffix, compressed in compressed_variants(existing):
+                    atomic_write(path + suffix, compressed)
+            return False
+
+    data = dumps(payload)
+    atomic_write(path, data)
+    if compress:
+        for suffix, compressed in compressed_variants(data):
+            atomic_write(path + suffix, compressed)
+    return True
+
+
+def record_hashes(records: Iterable[Dict], id_field: str) -> Dict[str, str]:
+    """Content hash of each record, by id (records without id are skipped)."""
+    return {str(record[id_field]): content_digest(record)[:RECORD_HASH_CHARS]
+            for record in records if record.get(id_field) not in (None, "")}
+
+
+def diff_hashes(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, List[str]]:
+    """Ids added, changed and removed between two record_hashes() results."""
+    return {
+        "added": sorted(set(current) - set(previous)),
+        "changed": sorted(i for i in current if i in previous and current[i] != previous[i]),
+        "removed": sorted(set(previous) - set(current)),
+    }
+
+
+def _read_json(path: str, default: Any) -> Any:
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_delta(directory: str, records: Iterable[Dict], id_field: str) -> Optional[Dict]:
+    """Write the changes since the previous call as `directory`/<timestamp>.json.
+
+    The record hashes of each call are kept in `directory`/hashes.json and
+    `directory`/index.json lists the delta files, newest first (at most
+    DELTA_HISTORY). The first call only records the hashes. Returns the
+    delta, or None if nothing changed."""
+    os.makedirs(directory, exist_ok=True)
+    hashes_path = os.path.join(directory, "hashes.json")
+    index_path = os.path.join(directory, "index.json")
+    previous = _read_json(hashes_path, None)
+    current = record_hashes(records, id_field)
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    delta = None
+    if previous is not None:
+        changes = diff_hashes(previous.get("records", {}), current)
+        if not any(changes.values()):
+            return None
+        delta = dict(changes, generated_at=generated_at, since=previous.get("generated_at"), id_field=id_field)
+        name = generated_at.replace("-", "").replace(":", "") + ".json"
+        atomic_write(os.path.join(directory, name), dumps(delta))
+
+        index = _read_json(index_path, {"deltas": []})
+        entries = [{"file": name, "generated_at": generated_at, "since": delta["since"],
+                    **{kind: len(ids) for kind, ids in changes.items()}}]
+        entries += [e for e in index["deltas"] if e["file"] != name]
+        for stale in entries[DELTA_HISTORY:]:
+            stale_path = os.path.join(directory, stale["file"])
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+        atomic_write(index_path, dumps({"id_field": id_field, "deltas": entries[:DELTA_HISTORY]}))
+
+    atomic_write(hashes_path, dumps({"generated_at": generated_at, "records": current}))
+    return delta
+
+
+def describe_delta(delta: Optional[Dict]) -> str:
+    """One-line summary of a write_delta() result."""
+    if delta is None:
+        return "no record changes"
+    return f"+{len(delta['added'])} ~{len(delta['changed'])} -{len(delta['removed'])}"
@@ -0,0 +1,194 @@
+"""
+Record/replay transport for the outbound HTTP calls of the fetch scripts.
+
+    live    requests go to the network (default)
+    record  requests go to the network and the responses are archived
+    replay  responses come from the archive only, without network access
+
+The archive is one SQLite file: each request (method, URL with sorted
+query parameters) points to the SHA-256 of its response body, and bodies
+are stored once per digest, zlib-compressed. Transport.get() stands in for
+requests.get() and Transport.urlopen() for urllib.request.urlopen(), so a
+script keeps its HTTP library and only routes its calls through a
+Transport.
+"""
+
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+import urllib.response
+import zlib
+from email.message import Message
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+MODES = ("live", "record", "replay")
+
+# Response headers kept in the archive
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After", "Location")
+
+
+class ReplayMiss(OSError):
+    """The request is not in the archive (replay mode). An OSError, like the
+    connection errors of requests and urllib, but callers that turn request
+    errors into empty results re-raise it: a replay from an incomplete
+    archive must fail instead of producing an empty dataset."""
+
+
+def request_key(url: str, params: Dict = None, method: str = "GET") -> str:
+    """Method and URL with the query parameters (from the URL and `params`) sorted."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items() if v is not None]
+    return f"{method} " + urlunsplit(parts._replace(query=urlencode(sorted(query))))
+
+
+class Archive:
+    """Content-addressed response archive (SQLite)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS exchanges ("
+            " key TEXT PRIMARY KEY, status INTEGER, headers TEXT, digest TEXT, recorded_at REAL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS bodies (digest TEXT PRIMARY KEY, body BLOB)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT e.status, e.headers, b.body FROM exchanges e"
+                " JOIN bodies b ON b.digest = e.digest WHERE e.key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), zlib.decompress(row[2])
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO bodies VALUES (?, ?)", (digest, zlib.compress(body, 9)))
+            self._db.execute("INSERT OR REPLACE INTO exchanges VALUES (?, ?, ?, ?, ?)",
+                             (key, status, json.dumps(headers), digest, time.time()))
+            self._db.commit()
+
+    def summary(self) -> str:
+        with self._lock:
+            exchanges, = self._db.execute("SELECT COUNT(*) FROM exchanges").fetchone()
+            bodies, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM bodies").fetchone()
+        return f"{exchanges} responses, {bodies} distinct bodies, {size / 1e6:.1f} MB compressed"
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _recorded_headers(headers) -> Dict[str, str]:
+    return {name: headers[name] for name in RECORDED_HEADERS if headers.get(name)}
+
+
+class Transport:
+    """Routes GET requests to the network, the archive or both (see MODES)."""
+
+    def __init__(self, mode: str = "live", archive_path: str = None):
+        if mode not in MODES:
+            raise ValueError(f"unknown transport mode {mode!r} (expected one of {', '.join(MODES)})")
+        if mode != "live" and not archive_path:
+            raise ValueError(f"transport mode {mode!r} needs an archive file")
+        self.mode = mode
+        self.archive = Archive(archive_path) if mode != "live" else None
+        self.replayed = 0
+        self.recorded = 0
+        self.missed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def offline(self) -> bool:
+        """True in replay mode: no request reaches the network, so no rate limit is needed."""
+        return self.mode == "replay"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _replay(self, key: str) -> Tuple[int, Dict[str, str], bytes]:
+        exchange = self.archive.get(key)
+        if exchange is None:
+            self._count("missed")
+            raise ReplayMiss(f"not in the archive: {key}")
+        self._count("replayed")
+        return exchange
+
+    def _record(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        self.archive.put(key, status, headers, body)
+        self._count("recorded")
+
+    def get(self, url: str, params: Dict = None, headers: Dict = None, timeout: float = 30,
+            stream: bool = False):
+        """Like requests.get(); conditional headers are not sent when recording,
+        so the archive always holds full responses."""
+        import requests
+
+        if self.mode == "live":
+            return requests.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+
+        key = request_key(url, params)
+        if self.mode == "record":
+            headers = {k: v for k, v in (headers or {}).items()
+                       if k.lower() not in ("if-none-match", "if-modified-since")}
+            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+            self._record(key, response.status_code, _recorded_headers(response.headers), response.content)
+            return response
+
+        status, recorded_headers, body = self._replay(key)
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers.update(recorded_headers)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def urlopen(self, request, timeout: float = 30):
+        """Like urllib.request.urlopen() (GET only)."""
+        if self.mode == "live":
+            return urllib.request.urlopen(request, timeout=timeout)
+
+        url = request.full_url if isinstance(request, urllib.request.Request) else request
+        key = request_key(url)
+        if self.mode == "record":
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    status, headers, body = response.status, _recorded_headers(response.headers), response.read()
+            except urllib.error.HTTPError as e:
+                status, headers, body = e.code, _recorded_headers(e.headers), e.read()
+            self._record(key, status, headers, body)
+        else:
+            status, headers, body = self._replay(key)
+
+        message = Message()
+        for name, value in headers.items():
+            message[name] = value
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, "recorded error", message, io.BytesIO(body))
+        return urllib.response.addinfourl(io.BytesIO(body), message, url, status)
+
+    def summary(self) -> str:
+        if self.mode == "live":
+            return "Transport: live"
+        counts = (f"{self.recorded} recorded" if self.mode == "record"
+                  else f"{self.replayed} replayed, {self.missed} missing")
+        return f"Transport ({self.mode}): {counts}; archive {self.archive.summary()}"
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
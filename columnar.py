@@ -0,0 +1,219 @@
+import logging
+from array import array
+
+from .stream import iter_pages
+
+log = logging.getLogger(__name__)
+
+FORMATS = ("arrow", "numpy", "pandas")
+
+# Columns with few distinct values, stored as dictionary codes + categories
+CATEGORICAL_COLUMNS = {
+    "Language",
+    "CouncilName",
+    "CouncilAbbreviation",
+    "PartyName",
+    "PartyAbbreviation",
+    "ParlGroupName",
+    "ParlGroupAbbreviation",
+    "CantonName",
+    "CantonAbbreviation",
+    "BusinessTypeName",
+    "BusinessTypeAbbreviation",
+    "BusinessStatusText",
+    "ResponsibleDepartmentName",
+    "ResponsibleDepartmentAbbreviation",
+    "SubmissionCouncilName",
+    "SubmissionCouncilAbbreviation",
+    "Function",
+    "MeetingCouncilAbbreviation",
+    "LanguageOfText",
+}
+
+# OData property types -> arrow type names (everything else is a string).
+# pyodata returns decimal.Decimal for Edm.Decimal, converted to float
+# (the metadata does not always give a precision and scale for decimal128)
+EDM_ARROW_TYPES = {
+    "Edm.Boolean": "bool_",
+    "Edm.Byte": "int16",
+    "Edm.Int16": "int16",
+    "Edm.Int32": "int32",
+    "Edm.Int64": "int64",
+    "Edm.Single": "float32",
+    "Edm.Double": "float64",
+    "Edm.Decimal": "float64",
+}
+
+
+def _require(module):
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{module} is required for this output format (pip install {module})"
+        ) from e
+
+
+def get_property_types(client, table):
+    """Return {column: Edm type name} from the service metadata."""
+    return {
+        p.name: p.typ.name
+        for p in client.client.schema.entity_type(table).proprties()
+    }
+
+
+class ColumnBuilder(object):
+    """
+    Accumulates decoded pages into typed columns.
+
+    Categorical columns are dictionary-encoded while rows are added: each
+    value is stored once in `categories` and rows only keep an int32 code
+    (-1 for null), so repeated strings are not kept per row.
+    """
+
+    def __init__(self, variables, categorical=CATEGORICAL_COLUMNS):
+        self.variables = list(variables)
+        self.categorical = {v for v in self.variables if v in categorical}
+        self.length = 0
+        self.values = {v: [] for v in self.variables if v not in self.categorical}
+        self.codes = {v: array("i") for v in self.categorical}
+        self.categories = {v: {} for v in self.categorical}
+
+    def add_page(self, page):
+        for name, values in self.values.items():
+            values.extend(row.get(name) for row in page)
+        for name in self.categorical:
+            codes = self.codes[name]
+            lookup = self.categories[name]
+            for row in page:
+                value = row.get(name)
+                if value is None:
+                    codes.append(-1)
+                    continue
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes.append(code)
+        self.length += len(page)
+
+    def category_list(self, name):
+        return list(self.categories[name])
+
+    def to_numpy(self):
+        """Dict of numpy arrays; categorical columns index into their categories."""
+        np = _require("numpy")
+        columns = {}
+        for name in self.variables:
+            if name in self.categorical:
+                categories = np.array(self.category_list(name) + [None], dtype=object)
+                columns[name] = categories[np.frombuffer(self.codes[name], dtype=np.int32)]
+            else:
+                values = self.values[name]
+                if any(v is None for v in values):
+                    columns[name] = np.array(values, dtype=object)
+                else:
+                    columns[name] = np.array(values)
+        return columns
+
+    def to_pandas(self):
+        """DataFrame with pandas.Categorical for the categorical columns."""
+        pd = _require("pandas")
+        np = _require("numpy")
+        columns = {}
+        for name in self.variables:
+            if name in self.categorical:
+                columns[name] = pd.Categorical.from_codes(
+                    np.frombuffer(self.codes[name], dtype=np.int32),
+                    categories=self.category_list(name),
+                )
+            else:
+                columns[name] = self.values[name]
+        return pd.DataFrame(columns, columns=self.variables)
+
+    def to_arrow(self, property_types=None):
+        """pyarrow.Table with dictionary-encoded categorical columns."""
+        pa = _require("pyarrow")
+        property_types = property_types or {}
+        arrays = []
+        for name in self.variables:
+            if name in self.categorical:
+                indices = pa.array(
+                    [c if c >= 0 else None for c in self.codes[name]], type=pa.int32()
+                )
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(
+                        indices, pa.array(self.category_list(name), type=pa.string())
+                    )
+                )
+            else:
+                edm_type = property_types.get(name)
+                values = self.values[name]
+                if edm_type == "Edm.Decimal":
+                    values = [None if v is None else float(v) for v in values]
+                arrays.append(pa.array(values, type=arrow_type(pa, edm_type)))
+        return pa.Table.from_arrays(arrays, names=self.variables)
+
+
+def arrow_type(pa, edm_type):
+    """Arrow type for an Edm type name (None lets pyarrow infer it)."""
+    if edm_type is None:
+        return None
+    if edm_type in ("Edm.DateTime", "Edm.DateTimeOffset"):
+        return pa.timestamp("ms")
+    return getattr(pa, EDM_ARROW_TYPES.get(edm_type, "string"))()
+
+
+def get_columnar(client, table, filter=None, format="arrow",  # noqa
+                 categorical=CATEGORICAL_COLUMNS, page_size=None, **kwargs):
+    """
+    Load `table` into a columnar result (`format` is arrow, numpy or pandas).
+
+    Rows are streamed page by page into a ColumnBuilder, so no list of
+    row dicts is ever built for the whole result.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+
+    builder = ColumnBuilder(client.get_variables(table), categorical)
+    for page in iter_pages(client, table, filter, page_size, **kwargs):
+        builder.add_page(page)
+    log.debug(f"Loaded {builder.length} rows from {table} into columns")
+
+    if format == "numpy":
+        return builder.to_numpy()
+    if format == "pandas":
+        return builder.to_pandas()
+    return builder.to_arrow(get_property_types(client, table))
+
+
+def to_parquet(client, table, path, filter=None,  # noqa
+               categorical=CATEGORICAL_COLUMNS, page_size=None, **kwargs):
+    """
+    Write `table` to a Parquet file, one row group per page.
+
+    Only one page is held in memory at a time. Returns the number of rows.
+    """
+    _require("pyarrow")
+    pq = __import__("pyarrow.parquet", fromlist=["parquet"])
+    variables = client.get_variables(table)
+    property_types = get_property_types(client, table)
+
+    writer = None
+    rows = 0
+    try:
+        for page in iter_pages(client, table, filter, page_size, **kwargs):
+            builder = ColumnBuilder(variables, categorical)
+            builder.add_page(page)
+            batch = builder.to_arrow(property_types)
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema)
+            writer.write_table(batch.cast(writer.schema))
+            rows += builder.length
+        if writer is None:
+            # empty result: still write a file with the right columns
+            empty = ColumnBuilder(variables, categorical).to_arrow(property_types)
+            pq.write_table(empty, path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
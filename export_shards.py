@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Découpe les jeux de données du site (debates_data.json, cdf_efk_data.json)
+en petits fichiers pour un premier affichage rapide :
+
+    data/<jeu>/manifest.json        nombre d'éléments, dates et hash par fragment
+    data/<jeu>/shards/<clé>.json    éléments sans les textes longs (avec un aperçu)
+    data/<jeu>/texts/<clé>.json     textes longs du fragment, chargés à la demande
+    data/deltas/<jeu>/              ids ajoutés, modifiés, supprimés à chaque export
+
+Les fragments sont listés du plus récent au plus ancien dans le manifeste :
+le premier affichage n'a besoin que du manifeste et du premier fragment.
+
+    python export_shards.py [--by session|year] [--output-dir data]
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "cantons"))
+from output import GENERATED_AT, content_digest, describe_delta, write_delta, write_json  # noqa: E402
+
+OUTPUT_DIR = "data"
+
+# Longueur de l'aperçu gardé dans les fragments (= aperçu affiché par debates.js)
+PREVIEW_CHARS = 400
+
+HTML_TAG = re.compile(r"<[^>]*>")
+
+
+def debate_date(item: dict) -> str:
+    """Date ISO d'un débat ("20151130" -> "2015-11-30")."""
+    date = item.get("date") or ""
+    return f"{date[:4]}-{date[4:6]}-{date[6:8]}" if len(date) == 8 else date
+
+
+def object_date(item: dict) -> str:
+    return item.get("date") or ""
+
+
+# Jeux de données : fichier source, identifiant, date, champs de texte long
+# et clés de découpage possibles
+DATASETS = {
+    "debates": {
+        "source": "debates_data.json",
+        "id": "id",
+        "date": debate_date,
+        "text_fields": ["text"],
+        "shard_keys": {
+            "session": lambda item: item.get("id_session") or "unknown",
+            "year": lambda item: debate_date(item)[:4] or "unknown",
+        },
+    },
+    "objects": {
+        "source": "cdf_efk_data.json",
+        "id": "shortId",
+        "date": object_date,
+        "text_fields": ["text", "text_de"],
+        "shard_keys": {
+            "year": lambda item: object_date(item)[:4] or "unknown",
+        },
+    },
+}
+
+
+def preview(text: str) -> str:
+    """Début du texte, sans balises HTML."""
+    plain = html.unescape(HTML_TAG.sub("", text or ""))
+    return plain[:PREVIEW_CHARS]
+
+
+def split_items(items: List[dict], shard_key: Callable[[dict], str]) -> Dict[str, List[dict]]:
+    shards = {}
+    for item in items:
+        shards.setdefault(str(shard_key(item)), []).append(item)
+    return shards
+
+
+def build_shard(items: List[dict], config: dict):
+    """Sépare les textes longs des éléments ; renvoie (éléments, textes par id)."""
+    light, texts = [], {}
+    for item in items:
+        item = dict(item)
+        item_texts = {}
+        for field in config["text_fields"]:
+            if item.get(field):
+                item_texts[field] = item.pop(field)
+                item[f"{field}_preview"] = preview(item_texts[field])
+                item[f"{field}_length"] = len(item_texts[field])
+        if item_texts:
+            texts[str(item[config["id"]])] = item_texts
+        light.append(item)
+    return light, texts
+
+
+def export_dataset(name: str, by: str = None, output_dir: str = OUTPUT_DIR) -> dict:
+    """Écrit les fragments et le manifeste d'un jeu de données ; renvoie le manifeste."""
+    config = DATASETS[name]
+    by = by if by in config["shard_keys"] else next(iter(config["shard_keys"]))
+    with open(config["source"], "r", encoding="utf-8") as f:
+        source = json.load(f)
+    items = source.get("items", [])
+
+    directory = Path(output_dir) / name
+    for sub in ("shards", "texts"):
+        (directory / sub).mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    written = 0
+    for key, shard_items in split_items(items, config["shard_keys"][by]).items():
+        shard_items.sort(key=config["date"], reverse=True)
+        light, texts = build_shard(shard_items, config)
+        dates = [config["date"](item) for item in shard_items if config["date"](item)]
+        shard_file = f"shards/{key}.json"
+        texts_file = f"texts/{key}.json"
+        written += write_json(str(directory / shard_file), {"items": light})
+        written += write_json(str(directory / texts_file), texts)
+        entries.append({
+            "key": key,
+            "file": shard_file,
+            "texts_file": texts_file,
+            "count": len(shard_items),
+            "date_min": min(dates) if dates else None,
+            "date_max": max(dates) if dates else None,
+            "hash": content_digest({"items": light})[:16],
+            "texts_hash": content_digest(texts)[:16],
+        })
+
+    # Du plus récent au plus ancien (le premier fragment suffit au premier affichage)
+    entries.sort(key=lambda e: (e["date_max"] or "", e["key"]), reverse=True)
+
+    # Supprimer les fragments qui n'existent plus (p. ex. après un changement de --by)
+    referenced = {e["file"] for e in entries} | {e["texts_file"] for e in entries}
+    for sub in ("shards", "texts"):
+        for path in (directory / sub).iterdir():
+            relative = f"{sub}/{path.name.split('.json')[0]}.json"
+            if relative not in referenced:
+                path.unlink()
+
+    manifest = {
+        "metadata": {
+            "generated_at": source.get("meta", {}).get("updated"),
+            "dataset": name,
+            "source": config["source"],
+            "shard_by": by,
+            "id_field": config["id"],
+            "text_fields": config["text_fields"],
+            "preview_chars": PREVIEW_CHARS,
+            "total_count": len(items),
+        },
+        # Les autres clés du fichier source (meta, new_ids, session_summary…)
+        "source_meta": {k: v for k, v in source.items() if k != "items"},
+        "shards": entries,
+    }
+    written += write_json(str(directory / "manifest.json"), manifest, volatile=[GENERATED_AT])
+    delta = write_delta(str(Path(output_dir) / "deltas" / name), items, config["id"])
+    print(f"{name}: {len(items)} éléments en {len(entries)} fragments par {by} "
+          f"({written} fichier(s) écrit(s), delta {describe_delta(delta)}) -> {directory}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Découpe les données du site en fragments")
+    parser.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument("--by", choices=["session", "year"], default="session",
+                        help="Clé de découpage des débats (les objets sont toujours découpés par année)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        if not os.path.exists(DATASETS[name]["source"]):
+            print(f"{name}: {DATASETS[name]['source']} introuvable, ignoré")
+            continue
+        export_dataset(name, args.by, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
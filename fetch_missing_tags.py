@@ -2,114 +2,277 @@
 """
 Script pour récupérer les domaines (tags) des objets parlementaires manquants
 pour les débats qui référencent des objets non présents dans cdf_efk_data.json
+
+    python fetch_missing_tags.py [--transport live|record|replay] [--archive-file FICHIER]
+                                 [--max-retries N]
 """
 
+import argparse
 import json
+import os
+import sys
+import time
+import urllib.error
 import urllib.request
 import urllib.parse
-import time
 from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "cantons"))
+from fetch_http import (DEFAULT_MAX_RETRIES, AdaptiveConcurrency, HostRateLimiter,  # noqa: E402
+                        RequestScheduler, map_bounded)
+from output import MISSING_TAGS_FIELDS, describe_delta, project, write_delta, write_json  # noqa: E402
+from metrics import Metrics  # noqa: E402
+from transport import MODES as TRANSPORT_MODES, ReplayMiss, Transport  # noqa: E402
 
 # Configuration
 DEBATES_FILE = "debates_data.json"
 OBJECTS_FILE = "cdf_efk_data.json"
 OUTPUT_FILE = "missing_objects_tags.json"
 
+# Journal (une ligne JSON par résultat), fusionné dans OUTPUT_FILE en fin de run
+JOURNAL_FILE = "missing_objects_tags.journal.jsonl"
+
+# Numéros ajoutés, modifiés ou supprimés à chaque run (voir output.write_delta)
+DELTA_DIR = os.path.join("data", "deltas", "missing_objects_tags")
+
 API_BASE = "https://ws.parlament.ch/odata.svc"
 
-def get_business_tags(business_number: str) -> dict:
-    """Récupère les tags d'un objet parlementaire depuis l'API OData."""
-    try:
-        # Construire l'URL avec le bon format
-        params = urllib.parse.urlencode({
-            "$filter": f"BusinessShortNumber eq '{business_number}'",
-            "$select": "BusinessShortNumber,TagNames",
-            "$format": "json"
-        })
-        url = f"{API_BASE}/Business?{params}"
-        
+# Langues récupérées -> champ de sortie
+LANGUAGE_FIELDS = {"FR": "tags", "DE": "tags_de", "IT": "tags_it"}
+
+# Longueur maximale d'une URL OData (les numéros sont regroupés en lots)
+MAX_URL_LENGTH = 2000
+
+# Requêtes en parallèle et débit maximal vers ws.parlament.ch
+MAX_WORKERS = 4
+RATE_LIMITER = HostRateLimiter(requests_per_second=2)
+
+# Reprises (backoff, Retry-After), disjoncteur et concurrence adaptative
+SCHEDULER = RequestScheduler(RATE_LIMITER, concurrency=AdaptiveConcurrency(initial=MAX_WORKERS, maximum=MAX_WORKERS),
+                             on_retry=lambda url: METRICS.retry(ENDPOINT))
+
+# Requêtes HTTP : réseau (live), réseau + archive (record) ou archive seule (replay)
+TRANSPORT = Transport()
+ARCHIVE_FILE = ".http_archive.sqlite"
+
+# Durée des étapes et métriques des requêtes (voir cantons/metrics.py)
+METRICS = Metrics("missing_tags")
+METRICS_FILE = "missing_objects_tags.metrics.json"
+ENDPOINT = "odata_business"
+
+
+def build_batch_url(business_numbers: List[str]) -> str:
+    """Construit l'URL OData pour un lot de numéros, dans les trois langues."""
+    numbers = " or ".join(f"BusinessShortNumber eq '{bn}'" for bn in business_numbers)
+    languages = " or ".join(f"Language eq '{lang}'" for lang in LANGUAGE_FIELDS)
+    params = urllib.parse.urlencode({
+        "$filter": f"({languages}) and ({numbers})",
+        "$select": "BusinessShortNumber,Language,TagNames",
+        "$format": "json"
+    })
+    return f"{API_BASE}/Business?{params}"
+
+
+def chunk_business_numbers(business_numbers: List[str],
+                           max_url_length: int = MAX_URL_LENGTH) -> List[List[str]]:
+    """Répartit les numéros en lots dont l'URL reste sous max_url_length."""
+    chunks = []
+    current = []
+    for bn in business_numbers:
+        if current and len(build_batch_url(current + [bn])) > max_url_length:
+            chunks.append(current)
+            current = []
+        current.append(bn)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def fetch_body(url: str) -> bytes:
+    """Corps d'une réponse OData ; en ligne, les erreurs réseau, 429 et 5xx
+    sont retentées par le SCHEDULER (HTTPError levée après la dernière tentative)."""
+    def send():
         req = urllib.request.Request(url)
         req.add_header('Accept', 'application/json')
-        
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode('utf-8'))
-        
-        results = data.get("d", {}).get("results", [])
-        
-        if results:
-            return {
-                "business_number": business_number,
-                "tags": results[0].get("TagNames", ""),
-                "found": True
-            }
-        else:
-            return {
-                "business_number": business_number,
-                "tags": "",
-                "found": False
-            }
+        start = time.perf_counter()
+        try:
+            with TRANSPORT.urlopen(req, timeout=30) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            METRICS.observe(ENDPOINT, time.perf_counter() - start, e.code)
+            raise
+        except Exception:
+            METRICS.observe(ENDPOINT, time.perf_counter() - start, "error")
+            raise
+        METRICS.observe(ENDPOINT, time.perf_counter() - start, response.status, len(body))
+        return body
+
+    if TRANSPORT.offline:
+        return send()
+    return SCHEDULER.request(url, send)
+
+
+def fetch_odata_rows(url: str) -> List[Dict]:
+    """Récupère toutes les lignes d'une requête OData (en suivant __next)."""
+    rows = []
+    while url:
+        body = fetch_body(url)
+        data = json.loads(body.decode('utf-8'))
+
+        d = data.get("d", {})
+        rows.extend(d.get("results", []) if isinstance(d, dict) else d)
+        url = d.get("__next") if isinstance(d, dict) else None
+    return rows
+
+
+def get_business_tags_batch(business_numbers: List[str]) -> Dict[str, dict]:
+    """Récupère les tags (FR/DE/IT) d'un lot d'objets en une seule requête OData."""
+    try:
+        rows = fetch_odata_rows(build_batch_url(business_numbers))
+    except ReplayMiss:
+        raise
     except Exception as e:
-        print(f"  Erreur pour {business_number}: {e}")
+        METRICS.error(ENDPOINT, e)
+        print(f"  Erreur pour le lot {business_numbers[0]}…{business_numbers[-1]}: {e}")
         return {
-            "business_number": business_number,
-            "tags": "",
-            "found": False,
-            "error": str(e)
+            bn: {"business_number": bn, "tags": "", "found": False, "error": str(e)}
+            for bn in business_numbers
         }
 
+    results = {
+        bn: {"business_number": bn, "tags": "", "tags_de": "", "tags_it": "", "found": False}
+        for bn in business_numbers
+    }
+    for row in rows:
+        result = results.get(row.get("BusinessShortNumber"))
+        field = LANGUAGE_FIELDS.get(row.get("Language"))
+        if result is None or field is None:
+            continue
+        result[field] = row.get("TagNames") or ""
+        result["found"] = True
+    return results
+
+
+def get_business_tags(business_number: str) -> dict:
+    """Récupère les tags d'un objet parlementaire depuis l'API OData."""
+    return get_business_tags_batch([business_number])[business_number]
+
+
+def save_output(results: List[dict]) -> None:
+    """Écrit le fichier de sortie (compact, trié, inchangé si le contenu est identique)."""
+    items = sorted((project(r, MISSING_TAGS_FIELDS) for r in results), key=lambda r: r["business_number"])
+    write_json(OUTPUT_FILE, {"items": items})
+    print(f"Delta : {describe_delta(write_delta(DELTA_DIR, items, 'business_number'))}")
+
+
+def load_output() -> Dict[str, dict]:
+    """Charge les résultats du fichier de sortie (business_number -> item)."""
+    if not Path(OUTPUT_FILE).exists():
+        return {}
+    with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+        return {item["business_number"]: item for item in json.load(f).get("items", [])}
+
+
+def append_journal(results: List[dict]) -> None:
+    """Ajoute des résultats au journal et les écrit immédiatement sur disque."""
+    with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_journal() -> Dict[str, dict]:
+    """Relit le journal d'un run interrompu (la dernière entrée d'un numéro l'emporte).
+    Une dernière ligne tronquée par un arrêt brutal est ignorée."""
+    entries = {}
+    if not Path(JOURNAL_FILE).exists():
+        return entries
+    with open(JOURNAL_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[item["business_number"]] = item
+    return entries
+
+
+def compact_journal(cache: Dict[str, dict]) -> List[dict]:
+    """Fusionne le journal dans le fichier de sortie puis supprime le journal."""
+    merged = dict(cache)
+    merged.update(load_journal())
+    results = list(merged.values())
+    save_output(results)
+    if Path(JOURNAL_FILE).exists():
+        os.remove(JOURNAL_FILE)
+    return results
+
+
 def main():
+    global TRANSPORT
+    parser = argparse.ArgumentParser(description="Tags des objets cités dans les débats mais absents de cdf_efk_data.json")
+    parser.add_argument("--transport", choices=TRANSPORT_MODES, default="live",
+                        help="live (défaut), record (archive aussi les réponses) ou replay (archive seule, hors ligne)")
+    parser.add_argument("--archive-file", default=ARCHIVE_FILE,
+                        help=f"Archive SQLite pour record/replay (défaut : {ARCHIVE_FILE})")
+    parser.add_argument("--metrics-file", default=METRICS_FILE,
+                        help=f"Rapport JSON des durées et des requêtes (défaut : {METRICS_FILE})")
+    parser.add_argument("--prometheus-file", metavar="FICHIER",
+                        help="Écrire aussi les métriques au format textfile Prometheus")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f"Reprises d'une requête après une erreur réseau, 429 ou 5xx (défaut : {DEFAULT_MAX_RETRIES})")
+    args = parser.parse_args()
+    TRANSPORT = Transport(args.transport, args.archive_file)
+    SCHEDULER.max_retries = max(0, args.max_retries)
+
     # Charger les données existantes
-    with open(DEBATES_FILE, "r", encoding="utf-8") as f:
-        debates = json.load(f)
-    
-    with open(OBJECTS_FILE, "r", encoding="utf-8") as f:
-        objects = json.load(f)
-    
+    with METRICS.stage("load_inputs"):
+        with open(DEBATES_FILE, "r", encoding="utf-8") as f:
+            debates = json.load(f)
+
+        with open(OBJECTS_FILE, "r", encoding="utf-8") as f:
+            objects = json.load(f)
+
     # Créer le set des objets existants
     existing_ids = set(item["shortId"] for item in objects["items"] if item.get("shortId"))
-    
+
     # Trouver les business_numbers manquants dans les débats
     missing_ids = set()
     for debate in debates["items"]:
         bn = debate.get("business_number")
         if bn and bn not in existing_ids:
             missing_ids.add(bn)
-    
+
     print(f"Objets existants: {len(existing_ids)}")
     print(f"Objets manquants dans les débats: {len(missing_ids)}")
-    
-    # Charger le fichier de cache s'il existe
-    cache = {}
-    if Path(OUTPUT_FILE).exists():
-        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
-            cache_data = json.load(f)
-            cache = {item["business_number"]: item for item in cache_data.get("items", [])}
+
+    # Charger le fichier de cache et le journal d'un éventuel run interrompu
+    cache = load_output()
+    journal = load_journal()
+    if cache:
         print(f"Cache existant: {len(cache)} objets")
-    
-    # Récupérer les tags pour les objets manquants (non en cache)
-    to_fetch = [bn for bn in sorted(missing_ids) if bn not in cache]
-    print(f"À récupérer: {len(to_fetch)} objets")
-    
-    results = list(cache.values())
-    
-    for i, bn in enumerate(to_fetch):
-        print(f"[{i+1}/{len(to_fetch)}] Récupération de {bn}...")
-        result = get_business_tags(bn)
-        results.append(result)
-        
-        # Pause pour ne pas surcharger l'API
-        time.sleep(0.5)
-        
-        # Sauvegarder régulièrement
-        if (i + 1) % 10 == 0:
-            with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-                json.dump({"items": results}, f, ensure_ascii=False, indent=2)
-            print(f"  Sauvegarde intermédiaire ({len(results)} objets)")
-    
-    # Sauvegarde finale
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump({"items": results}, f, ensure_ascii=False, indent=2)
-    
+    if journal:
+        print(f"Reprise: {len(journal)} objets dans le journal")
+    done = dict(cache)
+    done.update(journal)
+
+    # Récupérer les tags pour les objets manquants, par lots.
+    # Les échecs (entrées avec "error") sont retentés à chaque run.
+    to_fetch = [bn for bn in sorted(missing_ids) if bn not in done or "error" in done[bn]]
+    chunks = chunk_business_numbers(to_fetch)
+    print(f"À récupérer: {len(to_fetch)} objets en {len(chunks)} requête(s)")
+
+    with METRICS.stage("fetch_tags"):
+        for i, (chunk, batch) in enumerate(zip(chunks, map_bounded(get_business_tags_batch, chunks, MAX_WORKERS))):
+            append_journal([batch[bn] for bn in chunk])
+            print(f"[{i+1}/{len(chunks)}] {len(chunk)} objets ({chunk[0]} … {chunk[-1]})")
+
+    # Fusion du journal dans le fichier de sortie
+    with METRICS.stage("save_output"):
+        results = compact_journal(cache)
+
     # Statistiques
     found = len([r for r in results if r.get("found")])
     with_tags = len([r for r in results if r.get("tags")])
@@ -117,6 +280,14 @@ def main():
     print(f"  Total: {len(results)}")
     print(f"  Trouvés: {found}")
     print(f"  Avec tags: {with_tags}")
+    if TRANSPORT.mode != "live":
+        print(TRANSPORT.summary())
+    TRANSPORT.close()
+
+    print("\n" + METRICS.summary())
+    METRICS.write_report(args.metrics_file)
+    if args.prometheus_file:
+        METRICS.write_prometheus(args.prometheus_file)
 
 if __name__ == "__main__":
     main()
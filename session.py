@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get(
+    "SWISSPARL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "swissparlpy")
+)
+METADATA_MAX_AGE = 7 * 24 * 3600  # seconds
+POOL_SIZE = 16
+
+
+class MetadataCacheAdapter(HTTPAdapter):
+    """
+    Transport adapter that keeps the OData `$metadata` document on disk.
+
+    The metadata of the parliament service rarely changes, but every new
+    client downloads it before the first query. Responses for URLs ending
+    in `$metadata` are served from `cache_dir` while they are younger than
+    `max_age` seconds; all other requests go through the connection pool.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_age=METADATA_MAX_AGE, **kwargs):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _cache_path(self, url):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"metadata-{digest}.xml")
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or not request.url.split("?")[0].endswith("$metadata"):
+            return super().send(request, **kwargs)
+
+        path = self._cache_path(request.url)
+        with self._lock:
+            try:
+                if time.time() - os.path.getmtime(path) < self.max_age:
+                    log.debug(f"Load metadata from cache: {path}")
+                    with open(path, "rb") as f:
+                        return self._cached_response(request, f.read())
+            except OSError:
+                pass
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            with self._lock:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    tmp_path = f"{path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "wb") as f:
+                        f.write(response.content)
+                    os.replace(tmp_path, path)
+                except OSError as e:
+                    log.warning(f"Could not cache metadata in {path}: {e}")
+        return response
+
+    def _cached_response(self, request, content):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = content
+        response.headers["Content-Type"] = "application/xml;charset=utf-8"
+        response.encoding = "utf-8"
+        return response
+
+
+def create_session(cache_dir=CACHE_DIR, pool_size=POOL_SIZE):
+    """
+    Create a keep-alive session with a connection pool large enough for
+    threaded callers and an on-disk cache for the `$metadata` document.
+    """
+    session = requests.Session()
+    adapter = MetadataCacheAdapter(
+        cache_dir=cache_dir, pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
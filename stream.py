@@ -0,0 +1,70 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+
+def apply_filter(entities, filter=None, **kwargs):  # noqa
+    """Apply a filter the same way SwissParlClient.get_data does."""
+    if filter and callable(filter):
+        entities = entities.filter(filter(entities))
+    elif filter:
+        entities = entities.filter(filter)
+
+    if kwargs:
+        entities = entities.filter(**kwargs)
+    return entities
+
+
+def get_entities(client, table):
+    """New entity set request for `table` on the client's OData service."""
+    return getattr(client.client.entity_sets, table).get_entities()
+
+
+def key_order(client, table):
+    """`$orderby` value on the key properties of `table` (stable paging)."""
+    entity_type = client.client.schema.entity_set(table).entity_type
+    return ",".join(p.name for p in entity_type.key_proprties)
+
+
+def iter_pages(client, table, filter=None, page_size=None, **kwargs):  # noqa
+    """
+    Yield the rows of `table` page by page, as lists of dicts.
+
+    By default the server-side paging of the OData service is followed
+    (`__next` links). With `page_size`, pages are requested explicitly
+    with `$top` / `$skip`, ordered by the key of the table so that no row
+    is repeated or skipped between pages; paging ends on the first empty
+    page, as the server may return fewer rows than requested. Only the
+    current page is held in memory.
+    """
+    variables = client.get_variables(table)
+
+    if page_size:
+        order = key_order(client, table)
+        skip = 0
+        while True:
+            log.debug(f"Load page, table={table}, skip={skip}, top={page_size}")
+            entities = apply_filter(
+                get_entities(client, table), filter, **kwargs
+            ).order_by(order).skip(skip).top(page_size).execute()
+            page = [{k: getattr(e, k) for k in variables} for e in entities]
+            if not page:
+                return
+            yield page
+            skip += len(page)
+
+    request = apply_filter(get_entities(client, table), filter, **kwargs)
+    entities = request.execute()
+    while True:
+        yield [{k: getattr(e, k) for k in variables} for e in entities]
+        next_url = entities.next_url
+        if not next_url:
+            return
+        log.debug(f"Load page, table={table}, next_url={next_url}")
+        entities = request.next_url(next_url).execute()
+
+
+def iter_rows(client, table, filter=None, page_size=None, **kwargs):  # noqa
+    """Yield the rows of `table` one by one (see iter_pages)."""
+    for page in iter_pages(client, table, filter, page_size, **kwargs):
+        yield from page
@@ -0,0 +1,378 @@
+"""
+Scan the `Transcript` table for mentions of the Swiss Federal Audit Office
+(EFK / CDF / CFF) and build `debates_data.json`.
+
+Python port of the scan in `Recherche_Debats.R`: every (session, language)
+partition is fetched and filtered in its own worker process, and finished
+partitions are checkpointed so an interrupted scan can be resumed.
+
+    python -m swissparlpy.transcripts --sessions 5217 5218
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "cantons"))
+from output import describe_delta, write_delta, write_json  # noqa: E402
+
+log = logging.getLogger(__name__)
+
+# Legislatures 50 to 52
+ALL_SESSIONS = (
+    [str(s) for s in range(5001, 5020)]
+    + [str(s) for s in range(5101, 5123)]
+    + [str(s) for s in range(5201, 5219)]
+)
+LANGUAGES = ("DE", "FR", "IT")
+
+PATTERN_EFK_DE = re.compile(
+    r"(?<!Kom|Sub|Del|Prä)[^a-zA-Z0-9]EFK[^a-zA-Z0-9]"
+    r"|Eidgenössische(n|r)? Finanzkontrolle|Eidg\.? Finanzkontrolle",
+    re.IGNORECASE,
+)
+PATTERN_CDF_FR = re.compile(
+    r"(?<![a-zA-Z])CDF(?![a-zA-Z])|Contrôle fédéral des finances", re.IGNORECASE
+)
+PATTERN_CDF_IT = re.compile(r"Controllo federale delle finanze", re.IGNORECASE)
+# CdF = Commission des finances (not Contrôle fédéral des finances), case-sensitive
+PATTERN_FALSE_POSITIVE_CDF = re.compile(
+    r"CdF(-[NCSE]+)?|Commission des finances|16\.025|16\.026"
+)
+
+# language -> (pattern, exclusion pattern or None)
+LANGUAGE_PATTERNS = {
+    "DE": (PATTERN_EFK_DE, None),
+    "FR": (PATTERN_CDF_FR, PATTERN_FALSE_POSITIVE_CDF),
+    "IT": (PATTERN_CDF_IT, None),
+}
+
+HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+HTML_TAG = re.compile(r"<[^>]+>")
+
+DEFAULT_MAX_WORKERS = 6
+DEFAULT_OUTPUT = "debates_data.json"
+DEFAULT_CHECKPOINT_DIR = ".transcript_checkpoints"
+DEFAULT_TRACKING_FILE = "new_ids_debates_tracking.json"
+# Ids added, changed or removed by each run (see output.write_delta)
+DEFAULT_DELTA_DIR = os.path.join("data", "deltas", "debates_data")
+NEW_DAYS = 4  # how long a debate stays in `new_ids`
+
+
+def strip_html(text):
+    """Remove HTML comments and tags (like xfun::strip_html)."""
+    return HTML_TAG.sub("", HTML_COMMENT.sub("", text))
+
+
+def matches(text, language):
+    """True if a stripped transcript text mentions the audit office."""
+    pattern, exclude = LANGUAGE_PATTERNS[language]
+    if not pattern.search(text):
+        return False
+    return not (exclude and exclude.search(text))
+
+
+def to_record(row, text, language):
+    """Map a Transcript row to a debates_data.json item (without business info)."""
+    def as_str(value):
+        return None if value is None else str(value)
+
+    return {
+        "id": as_str(row.get("ID")),
+        "id_subject": as_str(row.get("IdSubject")),
+        "id_session": as_str(row.get("IdSession")),
+        "sort_order": row.get("SortOrder"),
+        "date": as_str(row.get("MeetingDate")),
+        "council": row.get("MeetingCouncilAbbreviation"),
+        "speaker": row.get("SpeakerFullName"),
+        "function_speaker": row.get("SpeakerFunction"),
+        "party": row.get("ParlGroupAbbreviation"),
+        "canton": row.get("CantonAbbreviation"),
+        "affair_id": None,
+        "business_number": None,
+        "business_title_fr": None,
+        "business_title_de": None,
+        "business_title_it": None,
+        "department": None,
+        "text": text,
+        "language": language,
+    }
+
+
+def _init_worker():
+    # never reuse a client (and its sockets) inherited from the parent
+    import swissparlpy
+    swissparlpy._client = None
+
+
+def scan_partition(session, language):
+    """
+    Fetch the transcripts of one session in one language and return the
+    matching records. Runs in a worker process: rows are streamed page by
+    page and filtered as they arrive, only the matches are sent back.
+
+    Errors are returned as a message: the exceptions of the OData client
+    carry the HTTP response and cannot be sent back to the parent process.
+    """
+    from swissparlpy import iter_data
+
+    records = []
+    scanned = 0
+    try:
+        for row in iter_data("Transcript", Language=language, IdSession=int(session)):
+            scanned += 1
+            if row.get("Text") is None:
+                continue
+            text = strip_html(row["Text"])
+            if matches(text, language):
+                records.append(to_record(row, text, language))
+    except Exception as e:
+        return {"session": session, "language": language, "error": f"{type(e).__name__}: {e}"}
+    return {"session": session, "language": language, "scanned": scanned, "records": records}
+
+
+class Checkpoints(object):
+    """
+    One JSON file per finished (session, language) partition.
+
+    Files are written atomically, so a partition is either complete on
+    disk or scanned again when the run is resumed.
+    """
+
+    def __init__(self, directory=DEFAULT_CHECKPOINT_DIR):
+        self.directory = directory
+
+    def path(self, session, language):
+        return os.path.join(self.directory, f"{session}_{language}.json")
+
+    def load(self, session, language):
+        try:
+            with open(self.path(session, language), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, result):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(result["session"], result["language"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") or name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+
+def scan(sessions, languages=LANGUAGES, max_workers=DEFAULT_MAX_WORKERS,
+         checkpoints=None):
+    """
+    Scan all (session, language) partitions across a process pool.
+
+    Partitions with a checkpoint are not fetched again. Returns the
+    matching records (deduplicated by id, in session order) and the list
+    of partitions that failed.
+    """
+    partitions = [(s, lang) for s in sessions for lang in languages]
+    results = {}
+    pending = []
+    for partition in partitions:
+        done = checkpoints.load(*partition) if checkpoints else None
+        if done is not None:
+            results[partition] = done
+        else:
+            pending.append(partition)
+    if results:
+        log.info(f"Resume: {len(results)} of {len(partitions)} partitions checkpointed")
+
+    failed = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(scan_partition, *p): p for p in pending}
+            for future in as_completed(futures):
+                session, language = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": str(e)}
+                if "error" in result:
+                    log.error(f"Session {session} {language}: {result['error']}")
+                    failed.append((session, language))
+                    continue
+                if checkpoints:
+                    checkpoints.save(result)
+                results[(session, language)] = result
+                log.info(
+                    f"Session {session} {language}: {len(result['records'])} found "
+                    f"in {result['scanned']} transcripts"
+                )
+
+    records = {}
+    for partition in partitions:
+        for record in results.get(partition, {}).get("records", []):
+            records.setdefault(record["id"], record)
+    return list(records.values()), failed
+
+
+def fetch_subject_business(subject_id):
+    """Business number, titles (FR/DE/IT) and department of a subject."""
+    from swissparlpy import iter_data
+
+    titles = {}
+    base = None
+    for language in ("FR", "DE", "IT"):
+        rows = list(iter_data("SubjectBusiness", Language=language, IdSubject=int(subject_id)))
+        if rows:
+            titles[language] = rows[0].get("Title")
+            if base is None and language != "IT":
+                base = rows[0]
+    if base is None:
+        return None
+
+    department = None
+    if base.get("BusinessNumber") is not None:
+        business = list(iter_data("Business", ID=base["BusinessNumber"], Language="DE"))
+        if business:
+            department = business[0].get("ResponsibleDepartmentAbbreviation")
+
+    def title(*languages):
+        return next((titles[lang] for lang in languages if titles.get(lang)), None)
+
+    return {
+        "affair_id": None if base.get("BusinessNumber") is None else str(base["BusinessNumber"]),
+        "business_number": base.get("BusinessShortNumber"),
+        "business_title_fr": title("FR", "DE"),
+        "business_title_de": title("DE", "FR"),
+        "business_title_it": title("IT", "FR"),
+        "department": department,
+    }
+
+
+def add_business_info(records, max_workers=DEFAULT_MAX_WORKERS):
+    """Fill the business fields of the records, one lookup per subject."""
+    subject_ids = sorted({r["id_subject"] for r in records if r["id_subject"]})
+    infos = {}
+
+    def lookup(subject_id):
+        try:
+            return fetch_subject_business(subject_id)
+        except Exception as e:
+            log.warning(f"Subject {subject_id}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for subject_id, info in zip(subject_ids, pool.map(lookup, subject_ids)):
+            if info:
+                infos[subject_id] = info
+
+    for record in records:
+        record.update(infos.get(record["id_subject"], {}))
+    log.info(f"Business info for {len(infos)} of {len(subject_ids)} subjects")
+    return records
+
+
+def write_debates_json(records, sessions, path=DEFAULT_OUTPUT,
+                       tracking_path=DEFAULT_TRACKING_FILE, new_days=NEW_DAYS,
+                       delta_dir=DEFAULT_DELTA_DIR):
+    """
+    Write `path` in the debates_data.json format.
+
+    Items of sessions that were not scanned are kept from the existing
+    file. Ids that were not there before are tracked with the date they
+    were first seen and listed in `new_ids` for `new_days` days.
+    Both files are written with output.write_json (atomic, compact, left
+    as they are when only `meta.updated` would change) and the item
+    changes are recorded in `delta_dir`.
+    """
+    existing = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            existing = json.load(f).get("items") or []
+    existing_ids = {item["id"] for item in existing}
+    scanned = set(sessions)
+
+    items = {}
+    for item in [i for i in existing if i["id_session"] not in scanned] + records:
+        items.setdefault(item["id"], item)
+    items = list(items.values())
+
+    tracking = {}
+    if os.path.exists(tracking_path):
+        with open(tracking_path, encoding="utf-8") as f:
+            tracking = json.load(f) or {}
+    today = datetime.date.today()
+    limit = (today - datetime.timedelta(days=new_days)).isoformat()
+    tracking = {i: d for i, d in tracking.items() if d >= limit}
+    for item in items:
+        if item["id"] not in existing_ids:
+            tracking.setdefault(item["id"], today.isoformat())
+    write_json(tracking_path, tracking, compress=False)
+
+    write_json(
+        path,
+        {
+            "meta": {
+                "sessions": ", ".join(sessions),
+                "count": len(items),
+                "updated": str(datetime.datetime.now()),
+            },
+            "new_ids": list(tracking),
+            "items": items,
+        },
+        volatile=[("meta", "updated")],
+    )
+    log.info(f"Delta: {describe_delta(write_delta(delta_dir, items, 'id'))}")
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scan parliament transcripts for EFK/CDF mentions"
+    )
+    parser.add_argument("--sessions", nargs="+", default=ALL_SESSIONS,
+                        help="Session ids to scan (default: legislatures 50-52)")
+    parser.add_argument("--languages", nargs="+", default=list(LANGUAGES),
+                        choices=LANGUAGES)
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Worker processes (default: %(default)s)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR,
+                        help="Per-partition checkpoints, removed after a complete run")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore existing checkpoints and scan everything again")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    checkpoints = Checkpoints(args.checkpoint_dir)
+    if args.no_resume:
+        checkpoints.clear()
+
+    records, failed = scan(args.sessions, args.languages, args.max_workers, checkpoints)
+    if failed:
+        log.error(
+            f"{len(failed)} partition(s) failed, {args.output} not written. "
+            "Run again to resume from the checkpoints."
+        )
+        return 1
+
+    log.info(f"Total: {len(records)} debates")
+    add_business_info(records, args.max_workers)
+    items = write_debates_json(records, args.sessions, args.output)
+    log.info(f"{args.output}: {len(items)} items")
+    checkpoints.clear()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())